@@ -1,9 +1,40 @@
+import asyncio
 import os
-from openai import OpenAI
-from dotenv import load_dotenv
+from functools import lru_cache
+
+import httpx
+
+from .llm_cache import cache_key, get_llm_cache
+from .rate_limiter import throttle
+
+
+@lru_cache(maxsize=1)
+def load_env() -> None:
+    """Load environment variables from the .env file (once per process)."""
+    from dotenv import load_dotenv  # imported lazily to keep start-up fast
+
+    load_dotenv()
+
+
+# Every agent talks to the same host, so share one keep-alive pool per
+# flavour (sync/async) instead of letting each OpenAI client open its own.
+# TLS handshakes are then amortised across agents and rounds. OpenRouter
+# speaks HTTP/2, so concurrent calls are multiplexed as streams over one
+# connection (httpcore caps them at the server's advertised stream limit).
+_POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=60)
+_SYNC_CLIENT = httpx.Client(limits=_POOL_LIMITS, http2=True)
+_HTTP_CLIENT = httpx.AsyncClient(limits=_POOL_LIMITS, http2=True)
+
+# Transient OpenRouter failures (429, 5xx, connection errors) are retried by
+# the OpenAI SDK with jittered exponential backoff, honouring Retry-After.
+# 3 retries = 4 attempts before a call gives up and returns None.
+_MAX_RETRIES = 3
+
+
+def _sampling(temperature: float | None) -> dict:
+    """Request parameters for *temperature* (omitted: the provider's default)."""
+    return {} if temperature is None else {"temperature": temperature}
 
-# Load environment variables from .env file
-load_dotenv()
 
 class Agent:
     """
@@ -18,6 +49,11 @@ class Agent:
             site_url (str | None): Optional. Your site URL for OpenRouter rankings.
             site_name (str | None): Optional. Your site name/title for OpenRouter rankings.
         """
+        # The openai SDK takes ~1 s to import, so defer it until the first
+        # agent is built instead of paying for it on every (re)load.
+        from openai import AsyncOpenAI, OpenAI
+
+        load_env()
         api_key = os.getenv("OPENROUTER_API_KEY")
         if not api_key:
             raise ValueError("OPENROUTER_API_KEY environment variable not set.")
@@ -32,31 +68,213 @@ class Agent:
         self.client = OpenAI(
             base_url="https://openrouter.ai/api/v1",
             api_key=api_key,
+            http_client=_SYNC_CLIENT,
+            max_retries=_MAX_RETRIES,
+        )
+        self.aclient = AsyncOpenAI(
+            base_url="https://openrouter.ai/api/v1",
+            api_key=api_key,
+            http_client=_HTTP_CLIENT,
+            max_retries=_MAX_RETRIES,
         )
 
-    def chat(self, messages: list[dict[str, str]]) -> str | None:
+    @classmethod
+    def http_client(cls) -> httpx.AsyncClient:
+        """Return the async pool shared by all agents, for other OpenRouter requests."""
+        return _HTTP_CLIENT
+
+    @classmethod
+    async def aclose(cls) -> None:
+        """Close the HTTP pools shared by all agents (call once on shutdown)."""
+        await _HTTP_CLIENT.aclose()
+        _SYNC_CLIENT.close()
+
+    def chat(
+        self,
+        messages: list[dict[str, str]],
+        cache_bypass: bool = False,
+        temperature: float | None = None,
+    ) -> str | None:
         """
         Sends a chat message sequence to the configured model and returns the response.
 
         Args:
             messages (list[dict[str, str]]): A list of message dictionaries,
                                              e.g., [{"role": "user", "content": "Hello!"}].
+            cache_bypass (bool): Skip the response-cache lookup and force a fresh
+                                 generation (the result is still stored).
+            temperature (float | None): Sampling temperature; None keeps the provider's
+                                        default. Only calls with None or 0 are cached.
 
         Returns:
             str | None: The content of the model's response, or None if an error occurs.
         """
+        # Explicitly sampled calls (temperature > 0) are never cached
+        cache = get_llm_cache() if not temperature else None
+        key = cache_key(self.model, messages, temperature) if cache else None
+        if cache and not cache_bypass and (hit := cache.get(key)) is not None:
+            return hit
+
         try:
             completion = self.client.chat.completions.create(
                 extra_headers=self.extra_headers if self.extra_headers else None,
                 model=self.model,
-                messages=messages
+                messages=messages,
+                **_sampling(temperature),
             )
-            return completion.choices[0].message.content
+            content = completion.choices[0].message.content
         except Exception as e:
             # Basic error handling, consider more specific handling
             print(f"Error during API call: {e}")
             return None
 
+        if cache and content:
+            cache.set(key, content)
+        return content
+
+    async def achat(
+        self,
+        messages: list[dict[str, str]],
+        cache_bypass: bool = False,
+        temperature: float | None = None,
+    ) -> str | None:
+        """
+        Async counterpart of `chat`, so several agents can be awaited concurrently.
+
+        Args:
+            messages (list[dict[str, str]]): A list of message dictionaries.
+            cache_bypass (bool): Skip the response-cache lookup and force a fresh generation.
+            temperature (float | None): Sampling temperature, as in `chat`.
+
+        Returns:
+            str | None: The content of the model's response, or None if an error occurs.
+        """
+        cache = get_llm_cache() if not temperature else None
+        key = cache_key(self.model, messages, temperature) if cache else None
+        if cache and not cache_bypass and (hit := await cache.aget(key)) is not None:
+            return hit
+
+        try:
+            async with throttle(self.model, messages):
+                completion = await self.aclient.chat.completions.create(
+                    extra_headers=self.extra_headers if self.extra_headers else None,
+                    model=self.model,
+                    messages=messages,
+                    **_sampling(temperature),
+                )
+            content = completion.choices[0].message.content
+        except Exception as e:
+            # Basic error handling, consider more specific handling
+            print(f"Error during async API call: {e}")
+            return None
+
+        if cache and content:
+            await cache.aset(key, content)
+        return content
+
+    async def achat_n(
+        self, messages: list[dict[str, str]], n: int, temperature: float | None = None
+    ) -> list[str | None]:
+        """
+        Requests *n* independent completions for the same messages in a single API call.
+
+        Not every provider behind OpenRouter honours `n`; missing choices are
+        topped up with individual `achat` calls so exactly *n* results are returned.
+
+        Args:
+            messages (list[dict[str, str]]): A list of message dictionaries.
+            n (int): Number of completions to return.
+            temperature (float | None): Sampling temperature, as in `chat`.
+
+        Returns:
+            list[str | None]: One entry per completion (None where a call failed).
+        """
+        if n == 1:
+            return [await self.achat(messages, temperature=temperature)]
+
+        contents: list[str | None] = []
+        try:
+            async with throttle(self.model, messages):
+                completion = await self.aclient.chat.completions.create(
+                    extra_headers=self.extra_headers if self.extra_headers else None,
+                    model=self.model,
+                    messages=messages,
+                    n=n,
+                    **_sampling(temperature),
+                )
+            contents = [choice.message.content for choice in completion.choices[:n]]
+        except Exception as e:
+            # Basic error handling, consider more specific handling
+            print(f"Error during batched API call: {e}")
+
+        if len(contents) < n:
+            # Independent samples: a cached reply would repeat the same one
+            contents += await asyncio.gather(
+                *(
+                    self.achat(messages, cache_bypass=True, temperature=temperature)
+                    for _ in range(n - len(contents))
+                )
+            )
+        return contents
+
+    async def aembed(self, text: str) -> list[float] | None:
+        """
+        Returns an embedding vector for *text*, using this agent's model as the embedding model.
+
+        Args:
+            text (str): The input to embed.
+
+        Returns:
+            list[float] | None: The embedding, or None if an error occurs.
+        """
+        try:
+            result = await self.aclient.embeddings.create(
+                extra_headers=self.extra_headers if self.extra_headers else None,
+                model=self.model,
+                input=text,
+            )
+            return result.data[0].embedding
+        except Exception as e:
+            # Basic error handling, consider more specific handling
+            print(f"Error during embedding API call: {e}")
+            return None
+
+    async def achat_stream(self, messages: list[dict[str, str]]):
+        """
+        Async counterpart of `chat_stream`.
+
+        Closing the generator early (e.g. via `contextlib.aclosing`) also closes
+        the underlying HTTP response, so the remaining tokens are not generated.
+
+        Args:
+            messages (list[dict[str, str]]): A list of message dictionaries.
+
+        Yields:
+            str: Chunks of the model's response content.
+        """
+        try:
+            async with throttle(self.model, messages):
+                stream = await self.aclient.chat.completions.create(
+                    extra_headers=self.extra_headers if self.extra_headers else None,
+                    model=self.model,
+                    messages=messages,
+                    stream=True
+                )
+        except Exception as e:
+            # Basic error handling, consider more specific handling
+            print(f"\nError during async streaming API call: {e}")
+            return
+        try:
+            async for chunk in stream:
+                content = chunk.choices[0].delta.content if chunk.choices else None
+                if content is not None:
+                    yield content
+        except Exception as e:
+            # Basic error handling, consider more specific handling
+            print(f"\nError during async streaming API call: {e}")
+        finally:
+            await stream.close()
+
     def chat_stream(self, messages: list[dict[str, str]]):
         """
         Sends a chat message sequence to the configured model and yields response chunks (streams).
@@ -84,6 +302,17 @@ class Agent:
             # Optionally re-raise or handle differently
             # raise
 
+@lru_cache(maxsize=32)
+def get_agent(model: str) -> Agent:
+    """
+    Returns a long-lived Agent for *model*, built on first use.
+
+    Agents hold no per-conversation state, so request handlers can share them.
+    Channels still build their own: their participants are told apart by
+    Agent identity, and the same model may be listed twice.
+    """
+    return Agent(model)
+
 # Example Usage (can be removed or placed in a separate example script)
 if __name__ == '__main__':
     # Ensure you have OPENROUTER_API_KEY set in your .env file or environment
@@ -33,15 +33,62 @@ that consensus has not been reached and will continue until *max_rounds* is
 hit.
 """
 
+import asyncio
+from contextlib import aclosing
 from dataclasses import dataclass
+from itertools import combinations
 import logging
 import re
-from typing import List, Dict, Tuple, Optional
+from typing import Any, List, Dict, Tuple, Optional
 
 from .agent import Agent
+from .semantic_cache import get_semantic_cache, models_signature
 
 logger = logging.getLogger(__name__)
 
+_WORD_RE = re.compile(r"\w+")
+
+# Only the sentinel prefix is matched; the content is sliced off afterwards so
+# long guidance never goes through the regex engine.
+_GUIDANCE_RE = re.compile(
+    r"\s*(CONSENSUS_REACHED|CONTINUE_DISCUSSION|CONSENSUS_FAILED)\s*:", re.IGNORECASE
+)
+# Characters of a streamed reply after which a missing sentinel means the
+# moderator ignored the protocol.
+_SENTINEL_LOOKAHEAD = 64
+
+_DEFAULT_PARTICIPANT_PROMPT = (
+    "You are an expert AI assistant collaborating with other AI "
+    "agents to solve the following task. Provide clear, concise, "
+    "and well-reasoned answers. Do *not* attempt to mediate – "
+    "focus on presenting your own reasoning."
+)
+
+_DEFAULT_GUIDING_PROMPT = (
+    "You are the moderator for a panel of AI agents working "
+    "together to complete a task. After each round, you must "
+    "evaluate their responses and decide whether they have "
+    "reached consensus. Use the protocol below strictly:\n"
+    "- Start your reply with \"CONSENSUS_REACHED:\" if they agree. "
+    "Immediately after the colon, state the final agreed-upon "
+    "answer in 1-3 sentences.\n"
+    "- Otherwise, start with \"CONTINUE_DISCUSSION:\" followed by "
+    "short guidance on what disagreements remain and how they "
+    "might converge next round."
+)
+
+
+def _cached_system_message(text: str) -> Dict[str, Any]:
+    """System message whose text providers may cache across requests.
+
+    Uses OpenRouter's ``cache_control`` content-part extension; providers
+    without prompt caching simply ignore the marker.
+    """
+    return {
+        "role": "system",
+        "content": [{"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}],
+    }
+
 
 @dataclass
 class ChannelConfig:
@@ -50,6 +97,9 @@ class ChannelConfig:
     max_rounds: int = 8  # Hard upper-bound for the discussion length
     guiding_system_prompt: str | None = None  # Optional extra system prompt for the moderator
     participant_system_prompt: str | None = None  # Optional extra system prompt for each participant
+    semantic_cache: bool = False  # Reuse answers of previously discussed, near-identical tasks
+    cache_scope: str | None = None  # Semantic cache entries are shared within this scope (the chat); skipped without it
+    auto_consensus_threshold: float | None = 0.85  # Min pairwise Jaccard to skip the moderator; None disables
 
 
 class Channel:
@@ -80,8 +130,21 @@ class Channel:
         self._history: Dict[Agent, List[Dict[str, str]]] = {
             agent: [] for agent in [self.guiding_agent, *self.participants]
         }
+        # Last message each agent *produced* (not prompts or guidance echoed
+        # into its history), kept up to date on append.
+        self._last_by_agent: Dict[Agent, Dict[str, str]] = {}
+
+        # Round-1 system messages never change for a channel, so build them
+        # once and share the (never mutated) dicts between prompts.
+        self._participant_system_msg = _cached_system_message(
+            self.config.participant_system_prompt or _DEFAULT_PARTICIPANT_PROMPT
+        )
+        self._guiding_system_msg = _cached_system_message(
+            self.config.guiding_system_prompt or _DEFAULT_GUIDING_PROMPT
+        )
+        self._task_msg = _cached_system_message(f"TASK: {self.task}")
 
-    def run(self) -> str:
+    async def run(self) -> str:
         """Execute the multi-agent conversation and return the final answer.
 
         Returns
@@ -91,27 +154,52 @@ class Channel:
             the maximum number of rounds is exceeded.
         """
 
+        # 0. A near-identical task already answered by the same panel in the
+        # same chat skips the whole discussion.
+        task_embedding = None
+        if self.config.semantic_cache and self.config.cache_scope is not None:
+            cache = get_semantic_cache()
+            cache_key = self.config.cache_scope + "|" + models_signature(
+                self.guiding_agent.model, (a.model for a in self.participants)
+            )
+            task_embedding = await cache.embed(self.task)
+            if task_embedding is not None:
+                cached = cache.lookup(task_embedding, cache_key)
+                if cached is not None:
+                    logger.info("Semantic cache hit, skipping discussion")
+                    self.stopped = True
+                    return cached
+
         for round_idx in range(1, self.config.max_rounds + 1):
             self.rounds_executed = round_idx
             logger.debug("Starting round %s", round_idx)
 
             # 1. Ask every participant for their latest contribution.
-            participant_msgs = self._collect_participant_responses(round_idx)
-
-            # 2. Ask the moderator to decide what happens next.
-            guidance_raw = self._request_guidance(participant_msgs, round_idx)
-            status, content = self._parse_guidance(guidance_raw)
+            participant_msgs = await self._collect_participant_responses(round_idx)
+
+            # 2. If participants already say the same thing there is nothing
+            # for the moderator to decide; otherwise ask it what happens next.
+            combined = self._format_responses(participant_msgs)
+            local_answer = self._local_consensus(participant_msgs)
+            if local_answer is not None:
+                logger.info("local consensus hit in round %s", round_idx)
+                status, content = "CONSENSUS_REACHED", local_answer
+            else:
+                guidance_raw = await self._request_guidance(combined, round_idx)
+                status, content = self._parse_guidance(guidance_raw)
 
             if status == "CONSENSUS_REACHED":
                 logger.info("Consensus reached in round %s", round_idx)
                 self.stopped = True
+                if task_embedding is not None:
+                    cache.store(task_embedding, cache_key, content.strip())
                 return content.strip()
 
             # If this was the last allowed round, we cannot iterate again.
             if round_idx == self.config.max_rounds:
                 logger.warning("Reached round limit without consensus, requesting failure summary.")
                 self.stopped = True
-                failure_summary = self._request_failure_summary(participant_msgs)
+                failure_summary = await self._request_failure_summary(combined)
                 # Ensure it begins with sentinel; if not, prepend.
                 if not failure_summary.upper().startswith("CONSENSUS_FAILED"):
                     failure_summary = f"CONSENSUS_FAILED: {failure_summary}"
@@ -130,13 +218,16 @@ class Channel:
             else "No consensus reached within the configured discussion limit."
         )
 
-    def _collect_participant_responses(self, round_idx: int) -> List[Tuple[Agent, str]]:
+    async def _collect_participant_responses(self, round_idx: int) -> List[Tuple[Agent, str]]:
         """Send the *task* plus conversational history to each participant.
 
+        All participants are queried concurrently, so a round takes as long as
+        the slowest agent rather than the sum of all of them.
+
         Returns
         -------
         List[Tuple[Agent, str]]
-            A list of (agent, response) tuples.
+            A list of (agent, response) tuples, in participant order.
         """
         participant_responses: List[Tuple[Agent, str]] = []
 
@@ -144,49 +235,79 @@ class Channel:
             logger.warning("Channel stopped. No further participant responses will be collected.")
             return participant_responses
 
-        # Collect responses from all participants before moving on to the guiding agent.
-        for agent in self.participants:
-            logger.debug(f"Collecting response from {agent.model}")
-            messages = self._build_participant_prompt(agent, round_idx)
-            response = agent.chat(messages) or ""
-            logger.info(f"Response from {agent.model}: {response}")
+        # Prompts are built up-front; replies are only recorded after the
+        # fan-out, so every agent sees the same view of the previous round.
+        prompts = [self._build_participant_prompt(agent, round_idx) for agent in self.participants]
+
+        # Participants running the same model with an identical prompt (e.g.
+        # round 1) are served by a single n-sample request instead of k calls.
+        by_model: Dict[str, List[int]] = {}
+        for idx, agent in enumerate(self.participants):
+            by_model.setdefault(agent.model, []).append(idx)
+
+        batches: List[List[int]] = []
+        for indices in by_model.values():
+            first = prompts[indices[0]]
+            if all(prompts[i] == first for i in indices[1:]):
+                batches.append(indices)
+            else:
+                batches.extend([i] for i in indices)
+
+        results = await asyncio.gather(
+            *(
+                self.participants[batch[0]].achat_n(prompts[batch[0]], len(batch))
+                for batch in batches
+            ),
+            return_exceptions=True,
+        )
+
+        replies: List[Optional[str]] = [None] * len(self.participants)
+        for batch, result in zip(batches, results):
+            if isinstance(result, BaseException):
+                logger.error("Participant %s failed: %s", self.participants[batch[0]].model, result)
+                continue
+            for idx, reply in zip(batch, result):
+                replies[idx] = reply
+
+        for agent, reply in zip(self.participants, replies):
+            response = reply or ""
+            logger.debug("Response from %s: %s", agent.model, response)
             participant_responses.append((agent, response))
 
-            # Update history.
-            self._history[agent].append({"role": "assistant", "content": response})
+            self._record_reply(agent, response)
 
         return participant_responses
 
-    def _build_participant_prompt(self, agent: Agent, round_idx: int) -> List[Dict[str, str]]:
+    def _record_reply(self, agent: Agent, content: str) -> None:
+        """Append a reply produced by *agent* to its history."""
+        message = {"role": "assistant", "content": content}
+        self._history[agent].append(message)
+        self._last_by_agent[agent] = message
+
+    def _build_participant_prompt(self, agent: Agent, round_idx: int) -> List[Dict[str, Any]]:
         """Compose the message list for a participant for this round."""
-        messages: List[Dict[str, str]] = []
+        messages: List[Dict[str, Any]] = []
 
         # 1) System-level instructions (only once at the beginning for clarity)
         if round_idx == 1:
-            system_prompt = (
-                self.config.participant_system_prompt
-                or (
-                    "You are an expert AI assistant collaborating with other AI "
-                    "agents to solve the following task. Provide clear, concise, "
-                    "and well-reasoned answers. Do *not* attempt to mediate – "
-                    "focus on presenting your own reasoning."
-                )
-            )
-            messages.append({"role": "system", "content": system_prompt})
-            messages.append({"role": "system", "content": f"TASK: {self.task}"})
+            messages.append(self._participant_system_msg)
+            messages.append(self._task_msg)
 
         # 2) Include this agent's previous conversation history (already stored).
         messages.extend(self._history[agent])
 
         # 3) Additionally include *public* messages – i.e. responses from other
-        # agents in the previous round.
+        # participants in the previous round. The moderator's guidance is
+        # already in this agent's history, and empty (failed) replies carry
+        # nothing, so neither is repeated here.
         if round_idx > 1:
             others_content = []
-            for other_agent, history in self._history.items():
+            for other_agent in self.participants:
                 if other_agent is agent:
                     continue
-                if history:
-                    others_content.append(history[-1]["content"])
+                message = self._last_by_agent.get(other_agent)
+                if message and message["content"]:
+                    others_content.append(message["content"])
             if others_content:
                 messages.append(
                     {
@@ -213,9 +334,14 @@ class Channel:
         self._history[agent].append(messages[-1])
         return messages
 
-    def _request_guidance(
-        self, participant_msgs: List[Tuple[Agent, str]], round_idx: int
-    ) -> str:
+    @staticmethod
+    def _format_responses(participant_msgs: List[Tuple[Agent, str]]) -> str:
+        """Render one round's replies as the moderator's ``AgentN: ...`` block."""
+        return "\n".join(
+            f"Agent{idx}: {content}" for idx, (_agent, content) in enumerate(participant_msgs, 1)
+        )
+
+    async def _request_guidance(self, combined: str, round_idx: int) -> str:
         """Ask the guiding agent to determine consensus and provide guidance."""
 
         if self.stopped:
@@ -223,53 +349,81 @@ class Channel:
             return "CONSENSUS_REACHED: Channel stopped."
 
         # Compose prompt for guiding agent.
-        messages: List[Dict[str, str]] = []
+        messages: List[Dict[str, Any]] = []
 
         if round_idx == 1:
-            system_prompt = (
-                self.config.guiding_system_prompt
-                or (
-                    "You are the moderator for a panel of AI agents working "
-                    "together to complete a task. After each round, you must "
-                    "evaluate their responses and decide whether they have "
-                    "reached consensus. Use the protocol below strictly:\n"\
-                    "- Start your reply with \"CONSENSUS_REACHED:\" if they agree. "
-                    "Immediately after the colon, state the final agreed-upon "
-                    "answer in 1-3 sentences.\n"\
-                    "- Otherwise, start with \"CONTINUE_DISCUSSION:\" followed by "
-                    "short guidance on what disagreements remain and how they "
-                    "might converge next round."
-                )
-            )
-            messages.append({"role": "system", "content": system_prompt})
-            messages.append({"role": "system", "content": f"TASK: {self.task}"})
+            messages.append(self._guiding_system_msg)
+            messages.append(self._task_msg)
 
-        combined = []
-        for idx, (_agent, content) in enumerate(participant_msgs, 1):
-            combined.append(f"Agent{idx}: {content}")
-        messages.append({"role": "user", "content": "\n".join(combined)})
+        messages.append({"role": "user", "content": combined})
 
-        response = self.guiding_agent.chat(messages) or ""
-        logger.info(f"Response from guiding agent ({self.guiding_agent.model}): {response}")
+        if round_idx == self.config.max_rounds:
+            response = await self._stream_final_guidance(messages)
+        else:
+            response = await self.guiding_agent.achat(messages) or ""
+        logger.debug("Response from guiding agent (%s): %s", self.guiding_agent.model, response)
 
-        self._history[self.guiding_agent].append({"role": "assistant", "content": response})
+        self._record_reply(self.guiding_agent, response)
         return response
 
+    async def _stream_final_guidance(self, messages: List[Dict[str, Any]]) -> str:
+        """Stream the last round's guidance, stopping once it cannot be used.
+
+        On the final round only a CONSENSUS_REACHED answer matters – anything
+        else is replaced by a failure summary – so generation is cancelled as
+        soon as the reply's status is known to be something else.
+        """
+        chunks: List[str] = []
+        decided = False
+        async with aclosing(self.guiding_agent.achat_stream(messages)) as stream:
+            async for chunk in stream:
+                chunks.append(chunk)
+                if decided:
+                    continue
+                head = "".join(chunks)
+                match = _GUIDANCE_RE.match(head)
+                if match:
+                    decided = True
+                    if match.group(1).upper() != "CONSENSUS_REACHED":
+                        break
+                elif len(head) > _SENTINEL_LOOKAHEAD:
+                    break
+        return "".join(chunks)
+
+    def _local_consensus(self, participant_msgs: List[Tuple[Agent, str]]) -> Optional[str]:
+        """Return the longest reply if all replies are lexically near-identical.
+
+        Agreement is the minimum pairwise Jaccard similarity of the replies'
+        lower-cased word sets; it must exceed `auto_consensus_threshold`.
+        """
+        threshold = self.config.auto_consensus_threshold
+        if threshold is None or len(participant_msgs) < 2:
+            return None
+
+        replies = [content for _agent, content in participant_msgs]
+        word_sets = [set(_WORD_RE.findall(reply.lower())) for reply in replies]
+        if not all(word_sets):
+            return None
+
+        for a, b in combinations(word_sets, 2):
+            if len(a & b) / len(a | b) <= threshold:
+                return None
+        return max(replies, key=len).strip()
+
     @staticmethod
     def _parse_guidance(text: str) -> Tuple[str, Optional[str]]:
         """Return (status, content) where status ∈ {CONSENSUS_REACHED, CONTINUE_DISCUSSION, CONSENSUS_FAILED}.
 
         If parsing fails, we default to CONTINUE_DISCUSSION.
         """
-        pattern = re.compile(r"^(CONSENSUS_REACHED|CONTINUE_DISCUSSION|CONSENSUS_FAILED)\s*:\s*(.*)", re.IGNORECASE | re.DOTALL)
-        match = pattern.match(text.strip())
+        match = _GUIDANCE_RE.match(text)
         if match:
             status = match.group(1).upper()
-            content = match.group(2).strip()
+            content = text[match.end():].strip()
             return status, content
         return "CONTINUE_DISCUSSION", None
 
-    def _request_failure_summary(self, participant_msgs: List[Tuple[Agent, str]]) -> str:
+    async def _request_failure_summary(self, combined: str) -> str:
         """Ask guiding agent for a final CONSENSUS_FAILED summary after limit.
         """
         messages: List[Dict[str, str]] = [
@@ -282,14 +436,11 @@ class Channel:
                 ),
             }
         ]
-        combined = []
-        for idx, (_agent, content) in enumerate(participant_msgs, 1):
-            combined.append(f"Agent{idx}: {content}")
-        messages.append({"role": "user", "content": "\n".join(combined)})
-
-        response = self.guiding_agent.chat(messages) or ""
-        logger.info(f"Failure summary from guiding agent ({self.guiding_agent.model}): {response}")
-        self._history[self.guiding_agent].append({"role": "assistant", "content": response})
+        messages.append({"role": "user", "content": combined})
+
+        response = await self.guiding_agent.achat(messages) or ""
+        logger.debug("Failure summary from guiding agent (%s): %s", self.guiding_agent.model, response)
+        self._record_reply(self.guiding_agent, response)
         return response
 
     def __repr__(self) -> str:
@@ -0,0 +1,142 @@
+"""Per-chat generation state: the busy flag and cancellation of in-flight replies.
+
+`chat_router` allows a single generation per chat (409 otherwise) and lets the
+client cancel it. By default both live in process memory, which only holds
+with a single uvicorn worker. With ``CONSENSUS_CHAT_STATE_BACKEND=redis`` (and
+``REDIS_URL``) the busy flag is a Redis key taken with ``SET NX EX`` and
+dropped with a compare-and-delete on the holder's token, and
+cancellation requests are published on a pub/sub channel that every worker
+listens to (see `ChatState.run_cancel_listener`), so whichever worker owns the
+generation cancels it.
+
+The futures themselves always stay in the worker running them.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import uuid
+from functools import lru_cache
+from typing import Dict, Optional
+
+__all__ = [
+    "ChatState",
+    "RedisChatState",
+    "get_chat_state",
+]
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_BUSY_TTL = 10 * 60  # seconds; frees the chat if a worker dies mid-reply
+_CANCEL_CHANNEL = "chat_cancel"
+# Delete the busy key only if it still holds the releasing request's token
+_RELEASE_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+
+class ChatState:
+    """Process-local state (single worker deployments)."""
+
+    def __init__(self) -> None:
+        self._busy: Dict[str, str] = {}
+        self._futures: Dict[str, asyncio.Future] = {}
+
+    async def acquire(self, chat_id: str) -> Optional[str]:
+        """Mark *chat_id* busy and return the holder's token.
+
+        Returns None if a generation is already running. Only the token's
+        holder can release the chat (see `release`).
+        """
+        if chat_id in self._busy:
+            return None
+        token = uuid.uuid4().hex
+        self._busy[chat_id] = token
+        return token
+
+    async def release(self, chat_id: str, token: str) -> None:
+        """Free *chat_id* if it is still held with *token* (a no-op otherwise)."""
+        if self._busy.get(chat_id) == token:
+            del self._busy[chat_id]
+
+    def track(self, chat_id: str, future: asyncio.Future) -> None:
+        """Register the future producing *chat_id*'s reply so it can be cancelled."""
+        self._futures[chat_id] = future
+
+    def untrack(self, chat_id: str) -> None:
+        self._futures.pop(chat_id, None)
+
+    def _cancel_local(self, chat_id: str) -> bool:
+        future = self._futures.get(chat_id)
+        if future is None or future.done():
+            return False
+        future.cancel()
+        return True
+
+    async def request_cancel(self, chat_id: str) -> None:
+        """Cancel the in-flight generation of *chat_id*, wherever it runs."""
+        self._cancel_local(chat_id)
+
+    async def run_cancel_listener(self) -> None:
+        """Serve cancellation requests from other workers (none in-process)."""
+
+
+class RedisChatState(ChatState):
+    """State shared by all workers (requires ``redis``)."""
+
+    def __init__(self, url: str, ttl: int = _DEFAULT_BUSY_TTL) -> None:
+        super().__init__()
+        import redis.asyncio as redis  # imported lazily to avoid mandatory dependency
+
+        self._client = redis.Redis.from_url(url, decode_responses=True)
+        self._release_script = self._client.register_script(_RELEASE_SCRIPT)
+        self.ttl = ttl
+        self._worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+    async def acquire(self, chat_id: str) -> Optional[str]:
+        token = f"{self._worker_id}:{uuid.uuid4().hex}"
+        if await self._client.set(f"busy:{chat_id}", token, nx=True, ex=self.ttl):
+            return token
+        return None
+
+    async def release(self, chat_id: str, token: str) -> None:
+        await self._release_script(keys=[f"busy:{chat_id}"], args=[token])
+
+    async def request_cancel(self, chat_id: str) -> None:
+        if not self._cancel_local(chat_id):
+            payload = json.dumps({"chat_id": chat_id, "action": "cancel"})
+            await self._client.publish(_CANCEL_CHANNEL, payload)
+
+    async def run_cancel_listener(self) -> None:
+        pubsub = self._client.pubsub()
+        await pubsub.subscribe(_CANCEL_CHANNEL)
+        try:
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                try:
+                    request = json.loads(message["data"])
+                except ValueError:
+                    logger.warning("Ignoring malformed cancel request: %r", message["data"])
+                    continue
+                if request.get("action") == "cancel" and self._cancel_local(str(request.get("chat_id"))):
+                    logger.info("Cancelled generation for chat %s on request", request["chat_id"])
+        finally:
+            await pubsub.aclose()
+
+
+@lru_cache(maxsize=1)
+def get_chat_state() -> ChatState:
+    """Return the process-wide chat state."""
+    if os.getenv("CONSENSUS_CHAT_STATE_BACKEND", "memory").lower() == "redis":
+        url = os.getenv("REDIS_URL")
+        if not url:
+            raise RuntimeError("CONSENSUS_CHAT_STATE_BACKEND=redis requires REDIS_URL to be set.")
+        return RedisChatState(url)
+    return ChatState()
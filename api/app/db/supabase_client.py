@@ -1,29 +1,33 @@
 """Supabase client setup and dependency helpers.
 
-This module centralises the creation of a shared Supabase client instance and
-exposes FastAPI dependencies that can be injected into routes and services.
+This module centralises the creation of the shared *async* Supabase client and
+exposes the FastAPI dependency that injects it into routes and services.
 
-We keep the helper thin so that business-logic and data-access code can focus
-on PostgREST calls rather than connection details.
+The client is created once in the application lifespan (see `app.main`) and
+stored on ``app.state.supabase``, so every request shares one HTTP connection
+pool and no PostgREST call blocks the event loop.
 """
 from __future__ import annotations
 
+import logging
 import os
-from functools import lru_cache
-from typing import Generator
 
-from fastapi import Depends
-from supabase import create_client, Client as SupabaseClient
+from fastapi.requests import HTTPConnection
+from supabase import AsyncClient as SupabaseClient, create_async_client
 
 __all__ = [
+    "init_supabase_client",
+    "warm_supabase_client",
+    "close_supabase_client",
     "get_supabase_client",
     "SupabaseClient",
 ]
 
+logger = logging.getLogger(__name__)
 
-@lru_cache(maxsize=1)
-def _init_client() -> SupabaseClient:
-    """Initialise and cache a singleton Supabase client.
+
+async def init_supabase_client() -> SupabaseClient:
+    """Create the application-wide async Supabase client.
 
     The URL and service role / anon key are loaded from the environment. If they
     are missing we raise early so that the application fails fast instead of
@@ -38,10 +42,31 @@ def _init_client() -> SupabaseClient:
             "Missing Supabase credentials: ensure SUPABASE_URL and SUPABASE_KEY are set."
         )
 
-    return create_client(url, key)
+    return await create_async_client(url, key)
+
+
+async def warm_supabase_client(client: SupabaseClient) -> None:
+    """Open the PostgREST connection (DNS, TCP, TLS, HTTP/2) before traffic arrives.
+
+    PostgREST calls are multiplexed over that one HTTP/2 connection, so a single
+    cheap request saves the first real query the handshake. Failures are only
+    logged: the pool connects lazily anyway.
+    """
+    try:
+        await client.postgrest.session.head("/")
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.warning("Supabase warm-up request failed: %s", exc)
 
 
-def get_supabase_client() -> Generator[SupabaseClient, None, None]:
-    """FastAPI dependency that yields the singleton Supabase client."""
-    client = _init_client()
-    yield client
+async def close_supabase_client(client: SupabaseClient) -> None:
+    """Release the HTTP connections held by *client*."""
+    await client.postgrest.aclose()
+
+
+async def get_supabase_client(conn: HTTPConnection) -> SupabaseClient:
+    """FastAPI dependency (HTTP and WebSocket routes) returning the client created at startup.
+
+    Declared ``async`` so FastAPI resolves it on the event loop; a plain
+    ``def`` dependency would be dispatched to the threadpool on every request.
+    """
+    return conn.app.state.supabase
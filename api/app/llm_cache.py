@@ -0,0 +1,183 @@
+"""Exact-match response cache for `Agent` completions.
+
+Identical requests (same model, messages and sampling parameters, ignoring
+whitespace and Unicode normalisation differences) are served from a local
+store instead of round-tripping to OpenRouter. This is mostly
+useful during development, tests and deterministic evaluation runs where the
+same prompts are replayed over and over.
+
+The cache is **opt-in**: set ``CONSENSUS_LLM_CACHE=1`` to enable it. The
+backend is chosen with ``CONSENSUS_LLM_CACHE_BACKEND`` (``memory`` – the
+default –, ``disk`` or ``redis``). Only calls whose caller leaves the
+temperature unset or passes ``0`` are looked up and stored (the temperature
+is part of the key); explicitly sampled completions (temperature > 0) are
+never cached. The cache never changes the sampling parameters it is given.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import unicodedata
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from threading import Lock
+from typing import Any, Protocol
+
+__all__ = [
+    "CacheBackend",
+    "MemoryBackend",
+    "DiskBackend",
+    "RedisBackend",
+    "LLMCache",
+    "cache_key",
+    "get_llm_cache",
+]
+
+_DEFAULT_DISK_DIR = Path.home() / ".cache" / "consensus-ai" / "llm"
+_DEFAULT_REDIS_TTL = 24 * 60 * 60  # seconds
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _normalize(value: Any) -> Any:
+    """NFC-normalise strings and collapse runs of whitespace, recursively.
+
+    Prompts that differ only in spacing or Unicode composition then share a
+    cache entry.
+    """
+    if isinstance(value, str):
+        return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFC", value)).strip()
+    if isinstance(value, list):
+        return [_normalize(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items()}
+    return value
+
+
+def cache_key(
+    model: str,
+    messages: list[dict[str, Any]],
+    temperature: float | None = None,
+    tools: list[dict[str, Any]] | None = None,
+) -> str:
+    """Return a stable SHA-256 key for a completion request."""
+    payload = {
+        "model": model,
+        "messages": _normalize(messages),
+        "temperature": temperature,
+        "tools": tools,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+class CacheBackend(Protocol):
+    """Minimal key/value interface every backend implements (blocking)."""
+
+    def get(self, key: str) -> str | None: ...
+
+    def set(self, key: str, value: str) -> None: ...
+
+
+class MemoryBackend:
+    """Size-bounded in-process LRU."""
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self.maxsize = maxsize
+        self._data: OrderedDict[str, str] = OrderedDict()
+        self._lock = Lock()  # Agent.chat is called from worker threads
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+class DiskBackend:
+    """One JSON file per key under *directory* (survives restarts)."""
+
+    def __init__(self, directory: Path = _DEFAULT_DISK_DIR) -> None:
+        self.directory = directory
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> str | None:
+        try:
+            return json.loads(self._path(key).read_text())["content"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        self._path(key).write_text(json.dumps({"content": value}))
+
+
+class RedisBackend:
+    """Shared cache for multi-process deployments (requires ``redis``)."""
+
+    def __init__(self, url: str, ttl: int | None = _DEFAULT_REDIS_TTL) -> None:
+        import redis  # imported lazily to avoid mandatory dependency
+
+        self._client = redis.Redis.from_url(url, decode_responses=True)
+        self.ttl = ttl
+
+    def get(self, key: str) -> str | None:
+        return self._client.get(f"llm:{key}")
+
+    def set(self, key: str, value: str) -> None:
+        self._client.set(f"llm:{key}", value, ex=self.ttl)
+
+
+class LLMCache:
+    """Front-end over a `CacheBackend` usable from sync and async code."""
+
+    def __init__(self, backend: CacheBackend) -> None:
+        self.backend = backend
+
+    def get(self, key: str) -> str | None:
+        return self.backend.get(key)
+
+    def set(self, key: str, value: str) -> None:
+        self.backend.set(key, value)
+
+    async def aget(self, key: str) -> str | None:
+        if isinstance(self.backend, MemoryBackend):
+            return self.backend.get(key)
+        return await asyncio.to_thread(self.backend.get, key)
+
+    async def aset(self, key: str, value: str) -> None:
+        if isinstance(self.backend, MemoryBackend):
+            self.backend.set(key, value)
+            return
+        await asyncio.to_thread(self.backend.set, key, value)
+
+
+@lru_cache(maxsize=1)
+def get_llm_cache() -> LLMCache | None:
+    """Return the process-wide cache, or *None* when caching is disabled."""
+    if os.getenv("CONSENSUS_LLM_CACHE") != "1":
+        return None
+
+    kind = os.getenv("CONSENSUS_LLM_CACHE_BACKEND", "memory").lower()
+    if kind == "disk":
+        backend: CacheBackend = DiskBackend()
+    elif kind == "redis":
+        url = os.getenv("REDIS_URL")
+        if not url:
+            raise RuntimeError("CONSENSUS_LLM_CACHE_BACKEND=redis requires REDIS_URL to be set.")
+        backend = RedisBackend(url)
+    else:
+        backend = MemoryBackend()
+    return LLMCache(backend)
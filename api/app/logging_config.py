@@ -15,6 +15,8 @@ from typing import Literal
 
 LogLevel = Literal["CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG"]
 
+_NOISY_LOGGERS = ("httpx", "httpcore", "openai", "supabase", "postgrest")
+
 
 def setup_logging(level: LogLevel | str = "INFO") -> None:
     """Configure the root logger if it has not been configured yet.
@@ -39,3 +41,7 @@ def setup_logging(level: LogLevel | str = "INFO") -> None:
         format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
         handlers=[logging.StreamHandler(sys.stdout)],
     )
+
+    # HTTP client libraries log every request at INFO; keep only problems.
+    for name in _NOISY_LOGGERS:
+        logging.getLogger(name).setLevel(logging.WARNING)
@@ -1,18 +1,49 @@
-from fastapi import FastAPI
+import asyncio
+import os
+from contextlib import asynccontextmanager, suppress
 
-# Configure application-wide logging before any other local imports
-from .logging_config import setup_logging
-setup_logging()
+import orjson
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
 
 # Routers
 from .routers import init_app as init_routers
+from .agent import Agent, load_env
+from .chat_state import get_chat_state
+from .logging_config import setup_logging
+from .db.supabase_client import close_supabase_client, init_supabase_client, warm_supabase_client
+from .services.consensus_service import cancel_running_channels
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Configured here rather than at import so module import order does not matter
+    setup_logging()
+    load_env()
+    # One async Supabase client (and connection pool) shared by all requests
+    app.state.supabase = await init_supabase_client()
+    await warm_supabase_client(app.state.supabase)
+    # Cancel requests for generations owned by this worker (Redis chat state)
+    cancel_listener = asyncio.create_task(get_chat_state().run_cancel_listener())
+    yield
+    cancel_listener.cancel()
+    with suppress(asyncio.CancelledError):
+        await cancel_listener
+    await cancel_running_channels()
+    await close_supabase_client(app.state.supabase)
+    # Release the keep-alive pools shared by every Agent
+    await Agent.aclose()
+
 
 app = FastAPI(
     title="Consensus Service",
     description="A service where LLMs collaborate to reach consensus on tasks",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan,
+    # orjson renders the large channel logs and message lists much faster
+    default_response_class=ORJSONResponse,
 )
 
 # ---------------------------------------------------------------------------
@@ -22,28 +53,51 @@ init_routers(app)
 
 app.add_middleware(ProxyHeadersMiddleware, trusted_hosts="*")
 
+# CORS: specify allowed origins – wildcard not allowed when allow_credentials=True.
+# ALLOWED_ORIGINS (comma-separated) overrides the defaults per deployment.
+_DEFAULT_ORIGINS = [
+    "http://localhost:5173",
+    "http://localhost:3000",
+    "https://consensus-ai.pages.dev",
+]
+load_env()  # ALLOWED_ORIGINS may come from .env; middleware is configured at import
+_allowed_origins = [
+    origin.strip() for origin in os.getenv("ALLOWED_ORIGINS", "").split(",") if origin.strip()
+] or _DEFAULT_ORIGINS
+
 app.add_middleware(
     CORSMiddleware,
-    # CORS: specify allowed origins – wildcard not allowed when allow_credentials=True
-    allow_origins=[
-        "http://localhost:5173",
-        "http://localhost:3000",
-        "https://consensus-ai.pages.dev",
-    ],
+    allow_origins=_allowed_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Pagination cursor of the chat/message list endpoints
+    expose_headers=["X-Next-Cursor"],
 )
 
 
-@app.get("/")
-async def root():
-    return {
+# Static body, serialised once at import
+_ROOT_BODY = orjson.dumps(
+    {
         "message": "Welcome to the Consensus Service API",
         "docs": "/docs",
         "version": "0.1.0"
     }
+)
+
+
+@app.get("/")
+async def root():
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True, log_level="info")
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        reload=True,
+        log_level="info",
+        loop="uvloop",
+        http="httptools",
+    )
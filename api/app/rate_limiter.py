@@ -0,0 +1,110 @@
+"""Client-side request/token rate limiting for OpenRouter calls.
+
+With participants fanned out via ``asyncio.gather`` and several channels
+running at once, bursts easily exceed a model's requests-per-minute (RPM) or
+tokens-per-minute (TPM) quota and come back as 429s. `AsyncTokenBucket`
+admits calls at the configured rates instead, so the API stays saturated
+without being tripped.
+
+Limits are read from ``OPENROUTER_RPM`` / ``OPENROUTER_TPM`` and apply per
+model. When neither is set, limiting is disabled.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+__all__ = ["AsyncTokenBucket", "estimate_tokens", "get_bucket", "throttle"]
+
+
+def _content_length(content: Any) -> int:
+    if isinstance(content, list):  # content parts, e.g. {"type": "text", "text": ...}
+        return sum(len(part.get("text") or "") for part in content)
+    return len(content or "")
+
+
+def estimate_tokens(messages: list[dict[str, Any]]) -> int:
+    """Rough prompt size (~4 characters per token)."""
+    return sum(_content_length(m.get("content")) for m in messages) // 4
+
+
+class AsyncTokenBucket:
+    """Dual bucket (requests + tokens) refilled continuously over a minute."""
+
+    def __init__(self, rpm: Optional[float] = None, tpm: Optional[float] = None) -> None:
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests = rpm or 0.0
+        self._tokens = tpm or 0.0
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        if self.rpm:
+            self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+        if self.tpm:
+            self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+
+    async def _take(self, tokens: int) -> None:
+        if self.tpm:
+            tokens = min(tokens, int(self.tpm))  # an oversized prompt must still pass eventually
+        while True:
+            async with self._lock:
+                self._refill()
+                wait = 0.0
+                if self.rpm and self._requests < 1:
+                    wait = (1 - self._requests) * 60 / self.rpm
+                if self.tpm and self._tokens < tokens:
+                    wait = max(wait, (tokens - self._tokens) * 60 / self.tpm)
+                if wait == 0.0:
+                    if self.rpm:
+                        self._requests -= 1
+                    if self.tpm:
+                        self._tokens -= tokens
+                    return
+            await asyncio.sleep(wait)
+
+    @asynccontextmanager
+    async def acquire(self, estimated_tokens: int = 0) -> AsyncIterator[None]:
+        """Wait until one request of *estimated_tokens* fits within the limits."""
+        await self._take(estimated_tokens)
+        yield
+
+
+_BUCKETS: Dict[str, AsyncTokenBucket] = {}
+
+
+@lru_cache(maxsize=1)
+def _limits() -> Tuple[Optional[float], Optional[float]]:
+    rpm = float(os.getenv("OPENROUTER_RPM") or 0) or None
+    tpm = float(os.getenv("OPENROUTER_TPM") or 0) or None
+    return rpm, tpm
+
+
+def get_bucket(model: str) -> Optional[AsyncTokenBucket]:
+    """Return the shared bucket for *model*, or *None* when limiting is off."""
+    rpm, tpm = _limits()
+    if rpm is None and tpm is None:
+        return None
+    bucket = _BUCKETS.get(model)
+    if bucket is None:
+        bucket = _BUCKETS[model] = AsyncTokenBucket(rpm, tpm)
+    return bucket
+
+
+@asynccontextmanager
+async def throttle(model: str, messages: list[dict[str, Any]]) -> AsyncIterator[None]:
+    """Admit one request for *model* through its bucket (no-op when disabled)."""
+    bucket = get_bucket(model)
+    if bucket is None:
+        yield
+        return
+    async with bucket.acquire(estimate_tokens(messages)):
+        yield
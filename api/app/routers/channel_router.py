@@ -1,14 +1,21 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import ORJSONResponse
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
-from supabase import Client as SupabaseClient
+import orjson
+
+from pydantic import BaseModel, ConfigDict, Field
+from supabase import AsyncClient as SupabaseClient
 
 from ..db.supabase_client import get_supabase_client
-# models module no longer used
-#
-from ..services.consensus_service import spawn_channel, get_channel_status
+from ..services.consensus_service import (
+    ChannelCapacityError,
+    spawn_channel,
+    get_channel_status,
+    wait_for_channel,
+    watch_channel,
+)
 
 router = APIRouter(prefix="/channels", tags=["channels"])
 
@@ -16,10 +23,12 @@ router = APIRouter(prefix="/channels", tags=["channels"])
 class CreateChannelRequest(BaseModel):
     task: str
     guiding_model: str
-    participant_models: List[str]
-    max_rounds: int = 8
+    participant_models: List[str] = Field(..., min_length=1)
+    max_rounds: int = Field(8, ge=1, le=20)
     chat_id: Optional[UUID] = None
 
+    model_config = ConfigDict(extra="forbid")
+
 
 class ChannelStatusResponse(BaseModel):
     status: str
@@ -35,31 +44,64 @@ async def create_channel(
 ):
     # TODO: optionally verify chat existence via Supabase
 
-    channel_id = await spawn_channel(client=client,
-        task=req.task,
-        guiding_model=req.guiding_model,
-        participant_models=req.participant_models,
-        max_rounds=req.max_rounds,
-        chat_id=req.chat_id,
-        #
-    )
+    try:
+        channel_id = await spawn_channel(client=client,
+            task=req.task,
+            guiding_model=req.guiding_model,
+            participant_models=req.participant_models,
+            max_rounds=req.max_rounds,
+            chat_id=req.chat_id,
+        )
+    except ChannelCapacityError as exc:
+        raise HTTPException(status_code=429, detail=str(exc)) from None
     return {"channel_id": channel_id}
 
 
+def _status_payload(status: Dict[str, Any]) -> Dict[str, Any]:
+    """Project a status record (cache entry or DB row) onto `ChannelStatusResponse`.
+
+    The records are produced by this service, so the polling hot path skips
+    building and re-validating a Pydantic model and serialises the dict as is.
+    """
+    return {
+        "status": status["status"],
+        "rounds_executed": status.get("rounds_executed") or 0,
+        "answer": status.get("answer"),
+        "error": status.get("error"),
+        "log": status.get("log"),
+    }
+
+
 @router.get("/{channel_id}", response_model=ChannelStatusResponse)
 async def get_channel_status_endpoint(
-    channel_id: str, client: SupabaseClient = Depends(get_supabase_client)
+    channel_id: str,
+    client: SupabaseClient = Depends(get_supabase_client),
+    wait: float = Query(0, ge=0, le=25, description="Long-poll: seconds to wait for the channel to end"),
 ):
-    cache = await get_channel_status(client, channel_id)
-    if cache and cache["status"] != "pending":
-        return ChannelStatusResponse(
-            status=cache["status"],
-            rounds_executed=cache.get("rounds_executed", 0),
-            answer=cache.get("answer"),
-            error=cache.get("error"),
-            log=cache.get("log"),
-        )
-
+    if wait:
+        cache = await wait_for_channel(client, channel_id, wait)
+    else:
+        cache = await get_channel_status(client, channel_id)
     if cache is None:
         raise HTTPException(status_code=404, detail="Channel not found")
-    return ChannelStatusResponse(**cache)
+    return ORJSONResponse(_status_payload(cache))
+
+
+@router.websocket("/{channel_id}/ws")
+async def channel_updates(
+    websocket: WebSocket, channel_id: str, client: SupabaseClient = Depends(get_supabase_client)
+):
+    """Push the channel status on every transition instead of being polled.
+
+    Each message is a `ChannelStatusResponse` as JSON; the socket is closed
+    once the channel has finished or failed.
+    """
+    await websocket.accept()
+    found = False
+    try:
+        async for status in watch_channel(client, channel_id):
+            found = True
+            await websocket.send_text(orjson.dumps(_status_payload(status)).decode())
+    except WebSocketDisconnect:
+        return
+    await websocket.close(code=1000 if found else 4404)
@@ -4,24 +4,37 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import os
 import uuid
-from typing import List, Annotated
+from collections import OrderedDict
+from contextlib import aclosing
+from typing import Any, Dict, List, Optional, Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from fastapi.responses import StreamingResponse
 
-from supabase import Client as SupabaseClient
+from supabase import AsyncClient as SupabaseClient
 
 from ..db.supabase_client import get_supabase_client
 from ..services import chat_service as chat_service
-from ..services.consensus_service import spawn_channel, get_channel_status
+from ..services.consensus_service import (
+    ChannelCapacityError,
+    create_channel,
+    discard_channel,
+    start_channel,
+    get_channel_statuses,
+    get_latest_channels,
+)
 from ..services import message_service as message_service
 from ..services import consensus_profile_service as profile_service
+from ..services.pagination import Cursor, decode_cursor, encode_cursor
 
-from ..schemas.chat import ChatCreate, ChatRead, ChatUpdate, ChatWithMessages
-from ..schemas.consensus_channel import ConsensusChannelRead
+from ..schemas.chat import ChatCreate, ChatListItem, ChatRead, ChatUpdate, ChatWithMessages
 from ..schemas.message import MessageRead, UserMessageCreate
-from ..agent import Agent
+from ..agent import get_agent
+from ..chat_state import get_chat_state
+from ..rate_limiter import estimate_tokens
 from .user_router import get_current_user
 from ..schemas.user import UserOut
 
@@ -29,6 +42,23 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/chats", tags=["chats"])
 
+# Paginated list responses put the cursor for the next (older) page here; pass
+# it back as ``before``. Absent on the last page.
+_NEXT_CURSOR_HEADER = "X-Next-Cursor"
+_MAX_PAGE_SIZE = 200
+# Messages per database page of the SSE history stream
+_STREAM_PAGE_SIZE = 50
+
+
+def _parse_cursor(before: Optional[str]) -> Optional[Cursor]:
+    if before is None:
+        return None
+    try:
+        return decode_cursor(before)
+    except ValueError:
+        raise HTTPException(status_code=422, detail="Invalid pagination cursor") from None
+
+
 # ---------------------------------------------------------------------------
 # Chat CRUD
 # ---------------------------------------------------------------------------
@@ -42,17 +72,43 @@ async def create_chat(
 ):
     """Create a new chat room."""
     row = await chat_service.create_chat(client, current_user.id, chat_in.model_dump())
-    return ChatRead.model_validate(row)
+    return row
 
 
-@router.get("", response_model=List[ChatRead])
+@router.get("", response_model=List[ChatListItem])
 async def list_chats(
+    response: Response,
     current_user: Annotated[UserOut, Depends(get_current_user)],
     client: SupabaseClient = Depends(get_supabase_client),
+    include_latest_channel: bool = False,
+    include_last_message: bool = False,
+    limit: Optional[int] = Query(None, ge=1, le=_MAX_PAGE_SIZE),
+    before: Optional[str] = None,
 ):
-    """Return all chats ordered by creation date (descending)."""
-    rows = await chat_service.list_chats(client, current_user.id)
-    return [ChatRead.model_validate(r) for r in rows]
+    """Return all chats ordered by creation date (descending).
+
+    With ``limit`` only one page is returned, starting after the ``before``
+    cursor; the next cursor is sent in the ``X-Next-Cursor`` header.
+
+    With ``include_latest_channel`` each chat also carries the status of its most
+    recent consensus channel, fetched in one query for all chats. With
+    ``include_last_message`` each chat carries a preview of its newest message,
+    embedded in the chats query itself.
+    """
+    rows = await chat_service.list_chats(
+        client,
+        current_user.id,
+        limit=limit,
+        before=_parse_cursor(before),
+        with_last_message=include_last_message,
+    )
+    if limit is not None and len(rows) == limit:
+        response.headers[_NEXT_CURSOR_HEADER] = encode_cursor(rows[-1])
+    if include_latest_channel and rows:
+        latest = await get_latest_channels(client, [r["id"] for r in rows])
+        rows = [{**r, "latest_channel": latest.get(r["id"])} for r in rows]
+    # Plain rows: response_model validates them once on the way out
+    return rows
 
 
 @router.get("/{chat_id}", response_model=ChatWithMessages)
@@ -73,31 +129,14 @@ async def get_chat(
 
     # Fetch messages via service
     msg_rows = await message_service.list_messages(client, chat_id)
-    message_dtos: list[MessageRead] = []
-    channel_ids: set[str] = set()
-    for r in msg_rows:
-        dto_dict = r.copy()
-        if r.get("channel_id"):
-            channel_ids.add(r["channel_id"])
-        message_dtos.append(dto_dict)
-
-    # Fetch channel statuses (if any)
-    channels_read: list[ConsensusChannelRead] = []
-    for cid in channel_ids:
-        chan = await get_channel_status(client, cid)
-        if chan:
-            channels_read.append(ConsensusChannelRead.model_validate(chan))
-
-    chat_dto = ChatWithMessages(
-        id=row["id"],
-        name=row.get("name"),
-        default_model=row["default_model"],
-        created_at=row["created_at"],
-        updated_at=row["updated_at"],
-        messages=[MessageRead.model_validate(d) for d in message_dtos],
-        channels=channels_read,
-    )
-    return chat_dto
+    channel_ids = {r["channel_id"] for r in msg_rows if r.get("channel_id")}
+
+    # Fetch channel statuses (if any) in a single batch
+    chans = await get_channel_statuses(client, channel_ids) if channel_ids else []
+
+    # Plain dicts: response_model validates them once on the way out (building
+    # the models here as well would validate every message twice)
+    return {**row, "messages": msg_rows, "channels": chans}
 
 
 @router.patch("/{chat_id}", response_model=ChatRead)
@@ -112,7 +151,7 @@ async def update_chat(
     row = await chat_service.update_chat(client, chat_id, current_user.id, updates)
     if row is None:
         raise HTTPException(status_code=404, detail="Chat not found")
-    return ChatRead.model_validate(row)
+    return row
 
 
 @router.delete("/{chat_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -125,6 +164,7 @@ async def delete_chat(
     deleted = await chat_service.delete_chat(client, chat_id, current_user.id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Chat not found")
+    _history_cache.pop(str(chat_id), None)
 
 
 # ---------------------------------------------------------------------------
@@ -134,75 +174,154 @@ async def delete_chat(
 
 
 
-# In-memory busy state per chat
-_chat_busy = {}
-_chat_futures: dict[str, asyncio.Future] = {}
+# Model-facing history ({"role", "content"} dicts) of recently active chats, so
+# a turn does not re-read every prior message. Supabase stays the source of
+# truth: an entry is dropped as soon as a turn starts and only re-stored once
+# both of its messages are persisted, so any failed, cancelled or consensus
+# turn makes the next one reload from the database. A history with a consensus
+# answer still pending is never cached, since that answer is filled in later.
+# Each entry is keyed to the id of the chat's newest message and only used
+# while that is still the newest one, so turns served by another worker
+# invalidate it too.
+_HISTORY_CACHE_SIZE = 1024
+_history_cache: OrderedDict[str, tuple[str, List[Dict[str, Any]]]] = OrderedDict()
+
+
+async def _load_history(
+    client: SupabaseClient, chat_id: uuid.UUID
+) -> tuple[List[Dict[str, Any]], bool]:
+    """Return the chat's model-facing history and whether it may be cached."""
+    entry = _history_cache.get(str(chat_id))
+    if entry is not None:
+        last_id, history = entry
+        if await message_service.latest_message_id(client, chat_id) == last_id:
+            return history, True
+        _history_cache.pop(str(chat_id), None)
+    rows = await message_service.list_messages(client, chat_id)
+    history = [{"role": r["role"], "content": r["content"]} for r in rows if r.get("content")]
+    pending = any(r.get("channel_id") and not r.get("content") for r in rows)
+    return history, not pending
+
+
+def _remember_history(chat_id: uuid.UUID, last_id: str, history: List[Dict[str, Any]]) -> None:
+    """Cache *history*, which ends with the stored message *last_id*."""
+    _history_cache[str(chat_id)] = (str(last_id), history)
+    _history_cache.move_to_end(str(chat_id))
+    while len(_history_cache) > _HISTORY_CACHE_SIZE:
+        _history_cache.popitem(last=False)
+
+
+# Prompt budget for a chat's history (CHAT_HISTORY_MAX_TOKENS overrides); the
+# oldest turns beyond it are not sent, so prefill cost stops growing with the
+# chat. The full history stays stored and cached.
+_DEFAULT_HISTORY_MAX_TOKENS = 32_000
+# The window start only moves in steps of this many messages. Between steps
+# each prompt extends the previous one, so provider prefix caches keep hitting.
+_HISTORY_WINDOW_STEP = 8
+
+
+def _prompt_window(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Return the most recent *messages* that fit the history token budget.
+
+    The last message (the new user turn) is always kept.
+    """
+    budget = int(os.getenv("CHAT_HISTORY_MAX_TOKENS", _DEFAULT_HISTORY_MAX_TOKENS))
+    sizes = [estimate_tokens([m]) for m in messages]
+    total = sum(sizes)
+    start = 0
+    while total > budget and start < len(messages) - 1:
+        total -= sizes[start]
+        start += 1
+    if start:
+        start = min(-(-start // _HISTORY_WINDOW_STEP) * _HISTORY_WINDOW_STEP, len(messages) - 1)
+    return messages[start:]
+
+
+async def _title_chat(
+    client: SupabaseClient,
+    chat_id: uuid.UUID,
+    row_chat: Dict[str, Any],
+    user_id: uuid.UUID,
+    content: str,
+) -> None:
+    """Give the chat a proper title the first time a user speaks (never raises)."""
+    if row_chat.get("name") not in (None, "", "New Conversation"):
+        return
+    from ..services.title_service import make_title  # late import to avoid cycles
+    try:
+        title = await make_title(content)
+        if title:
+            await chat_service.rename_chat(client, chat_id, user_id, title)
+            row_chat["name"] = title
+    except Exception:  # pylint: disable=broad-except
+        # Never let title generation break the main request flow
+        logger.warning("Could not title chat %s", chat_id, exc_info=True)
+
+
+# Keep reverse proxies (nginx) from buffering tokens until the response ends
+_STREAM_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
 
 
 @router.post("/{chat_id}/messages/stream")
 async def send_message_stream(
     chat_id: uuid.UUID,
     msg_in: UserMessageCreate,
+    request: Request,
     current_user: Annotated[UserOut, Depends(get_current_user)],
     client: SupabaseClient = Depends(get_supabase_client),
 ):
-    """Stream assistant response tokens for a given user message."""
+    """Stream assistant response tokens for a given user message.
+
+    Tokens are sent as raw text, or as Server-Sent Events
+    (``data: {"delta": ...}``) when the client accepts ``text/event-stream``.
+    """
 
     # Prevent concurrent generations per chat
-    if _chat_busy.get(str(chat_id), False):
+    chat_state = get_chat_state()
+    lock_token = await chat_state.acquire(str(chat_id))
+    if lock_token is None:
         raise HTTPException(status_code=409, detail="Agent is still responding. Please wait for the previous response to complete.")
-    _chat_busy[str(chat_id)] = True
 
+    # Only the owner's requests may read (and cache) the chat's history
     row_chat = await chat_service.get_chat(client, chat_id)
     if row_chat is None or row_chat["user_id"] != str(current_user.id):
-        _chat_busy[str(chat_id)] = False
+        await chat_state.release(str(chat_id), lock_token)
         raise HTTPException(status_code=404, detail="Chat not found")
+    history, cacheable = await _load_history(client, chat_id)
+
+    # Title the chat (first turn only) while the reply is generated
+    title_task = asyncio.create_task(_title_chat(client, chat_id, row_chat, current_user.id, msg_in.content))
 
     # 1) Persist the user message (fire-and-forget)
     await message_service.create_user_message(client, chat_id, msg_in.content)
+    _history_cache.pop(str(chat_id), None)
 
-    # ------------------------------------------------------------------
-    # Give the chat a proper title the first time a user speaks
-    # ------------------------------------------------------------------
-    if row_chat.get("name") in (None, "", "New Conversation"):
-        from ..services.title_service import make_title  # late import to avoid cycles
-        try:
-            title = await make_title(msg_in.content)
-            if title:
-                await chat_service.update_chat(client, chat_id, current_user.id, {"name": title})
-                # Refresh the in-memory row_chat dict so downstream code (if any)
-                # sees the updated title
-                row_chat["name"] = title
-        except Exception:  # pylint: disable=broad-except
-            # Never let title generation break the main request flow
-            pass
-
-    # 2) Assemble conversation history
-    rows_history = await message_service.list_messages(client, chat_id)
-    messages_payload = [
-        {"role": r["role"], "content": r["content"]} for r in rows_history if r.get("content")
-    ]
+    # 2) Assemble conversation history (prior messages + the new user turn)
+    messages_payload = [*history, {"role": "user", "content": msg_in.content}]
 
     model_to_use = msg_in.model or row_chat["default_model"]
 
-    loop = asyncio.get_running_loop()
     queue: asyncio.Queue[str | None] = asyncio.Queue()
     collected_tokens: list[str] = []
 
-    def _run_and_stream() -> None:
+    async def _run_and_stream() -> None:
         try:
-            agent = Agent(model_to_use)
-            for token in agent.chat_stream(messages_payload):
-                collected_tokens.append(token)
-                asyncio.run_coroutine_threadsafe(queue.put(token), loop)
+            agent = get_agent(model_to_use)
+            # aclosing: on cancellation the upstream HTTP stream is closed too
+            async with aclosing(agent.achat_stream(_prompt_window(messages_payload))) as stream:
+                async for token in stream:
+                    collected_tokens.append(token)
+                    queue.put_nowait(token)
         except Exception as exc:  # pylint: disable=broad-except
             logger.error("Streaming generation failed: %s", exc)
         finally:
-            asyncio.run_coroutine_threadsafe(queue.put(None), loop)
+            queue.put_nowait(None)
 
-    # Launch in executor so we don't block the event loop
-    fut = loop.run_in_executor(None, _run_and_stream)
-    _chat_futures[str(chat_id)] = fut
+    # Generate on the event loop; the task is what /cancel cancels
+    fut = asyncio.create_task(_run_and_stream())
+    chat_state.track(str(chat_id), fut)
+
+    sse = "text/event-stream" in request.headers.get("accept", "")
 
     async def _streamer():
         try:
@@ -210,15 +329,30 @@ async def send_message_stream(
                 chunk = await queue.get()
                 if chunk is None:
                     break
-                yield chunk
+                yield b"data: " + orjson.dumps({"delta": chunk}) + b"\n\n" if sse else chunk
         finally:
-            _chat_futures.pop(str(chat_id), None)
+            # Stop generating if the client went away mid-stream
+            fut.cancel()
+            chat_state.untrack(str(chat_id))
             assistant_content = "".join(collected_tokens)
             if assistant_content.strip():
-                await message_service.create_assistant_message(client, chat_id, model_to_use, assistant_content)
-            _chat_busy[str(chat_id)] = False
-
-    return StreamingResponse(_streamer(), media_type="text/plain")
+                assistant_row = await message_service.create_assistant_message(
+                    client, chat_id, model_to_use, assistant_content
+                )
+                if cacheable and assistant_row is not None:
+                    _remember_history(
+                        chat_id,
+                        assistant_row["id"],
+                        [*messages_payload, {"role": "assistant", "content": assistant_content}],
+                    )
+            await title_task
+            await chat_state.release(str(chat_id), lock_token)
+
+    return StreamingResponse(
+        _streamer(),
+        media_type="text/event-stream" if sse else "text/plain",
+        headers=_STREAM_HEADERS,
+    )
 
 
 @router.post("/{chat_id}/messages", response_model=MessageRead, status_code=status.HTTP_201_CREATED)
@@ -229,42 +363,28 @@ async def send_message(
     client: SupabaseClient = Depends(get_supabase_client),
 ):
     """Send a *user* message and return the assistant response (both stored)."""
-
     # Check if agent is busy for this chat
-    if _chat_busy.get(str(chat_id), False):
+    chat_state = get_chat_state()
+    lock_token = await chat_state.acquire(str(chat_id))
+    if lock_token is None:
         raise HTTPException(status_code=409, detail="Agent is still responding. Please wait for the previous response to complete.")
-    _chat_busy[str(chat_id)] = True
+    title_task: asyncio.Task | None = None
     try:
+        # Only the owner's requests may read (and cache) the chat's history
         row_chat = await chat_service.get_chat(client, chat_id)
         if row_chat is None or row_chat["user_id"] != str(current_user.id):
-            _chat_busy[str(chat_id)] = False
             raise HTTPException(status_code=404, detail="Chat not found")
+        history, cacheable = await _load_history(client, chat_id)
 
-        # 1) Persist *user* message
-        user_msg = await message_service.create_user_message(client, chat_id, msg_in.content)
-        user_msg_id = user_msg["id"]
+        # 1) The *user* message is persisted with the reply (direct path) or
+        # right before the channel starts (consensus path)
+        _history_cache.pop(str(chat_id), None)
 
-        # ------------------------------------------------------------------
-        # Give the chat a proper title the first time a user speaks
-        # ------------------------------------------------------------------
-        if row_chat.get("name") in (None, "", "New Conversation"):
-            from ..services.title_service import make_title  # late import to avoid cycles
-            try:
-                title = await make_title(msg_in.content)
-                if title:
-                    await chat_service.update_chat(client, chat_id, current_user.id, {"name": title})
-                    # Refresh the in-memory row_chat dict so downstream code (if any)
-                    # sees the updated title
-                    row_chat["name"] = title
-            except Exception:  # pylint: disable=broad-except
-                # Never let title generation break the main request flow
-                pass
+        # Title the chat (first turn only) while the reply is generated
+        title_task = asyncio.create_task(_title_chat(client, chat_id, row_chat, current_user.id, msg_in.content))
 
         # 2) Build conversation history for the assistant call
-        rows_history = await message_service.list_messages(client, chat_id)
-        messages_payload = [
-            {"role": r["role"], "content": r["content"]} for r in rows_history if r.get("content")
-        ]
+        messages_payload = [*history, {"role": "user", "content": msg_in.content}]
 
         # 3) Call the model (potentially different from default)
         model_to_use = msg_in.model or row_chat["default_model"]
@@ -286,66 +406,130 @@ async def send_message(
                 guiding = msg_in.guiding_model or row_chat["default_model"]
                 participants = msg_in.participant_models or [row_chat["default_model"]]
                 rounds = msg_in.max_rounds or 8
-            # spawn_channel imported from supabase service above
-            channel_id = await spawn_channel(
-                client=client,
-                task=msg_in.content,
-                guiding_model=guiding,
-                participant_models=participants,
-                max_rounds=rounds,
-                chat_id=chat_id,
-            )
-            # Placeholder assistant message (empty until consensus finishes)
-            assistant_msg = await message_service.create_assistant_placeholder(client, chat_id, channel_id)
+            # Create first: a full channel backlog is refused before anything is stored
+            try:
+                channel_id = await create_channel(
+                    client=client,
+                    task=msg_in.content,
+                    guiding_model=guiding,
+                    participant_models=participants,
+                    max_rounds=rounds,
+                    chat_id=chat_id,
+                )
+            except ChannelCapacityError as exc:
+                raise HTTPException(status_code=429, detail=str(exc)) from None
+            # User turn + placeholder assistant message (empty until consensus
+            # finishes), stored in one request. The run fills that placeholder
+            # in, so it only starts once the placeholder exists.
+            try:
+                assistant_msg = await message_service.create_consensus_exchange(
+                    client, chat_id, msg_in.content, channel_id
+                )
+            except Exception:
+                await discard_channel(client, channel_id, "Could not store the chat messages")
+                raise
+            start_channel(client, channel_id, chat_id)
             # Attach minimal channel info
-            return MessageRead.model_validate({**assistant_msg, "channel": {"id": channel_id, "status": "pending", "rounds_executed": 0, "created_at": assistant_msg["created_at"], "answer": None}})
+            return {**assistant_msg, "channel": {"id": channel_id, "status": "pending", "rounds_executed": 0, "created_at": assistant_msg["created_at"], "answer": None}}
 
         # ------------------------------
         # DIRECT LLM path
         # ------------------------------
-        loop = asyncio.get_running_loop()
-        future: asyncio.Future = loop.run_in_executor(None, Agent(model_to_use).chat, messages_payload)
-        _chat_futures[str(chat_id)] = future
+        future: asyncio.Future = asyncio.create_task(
+            get_agent(model_to_use).achat(_prompt_window(messages_payload), msg_in.cache_bypass)
+        )
+        chat_state.track(str(chat_id), future)
         try:
             assistant_content = await future
         except asyncio.CancelledError:
             logger.info("Generation cancelled for chat %s", chat_id)
+            # Keep the user's turn even though no reply was produced
+            await message_service.create_user_message(client, chat_id, msg_in.content)
             raise HTTPException(status_code=499, detail="Generation cancelled")
         finally:
-            _chat_futures.pop(str(chat_id), None)
+            chat_state.untrack(str(chat_id))
         assistant_content = assistant_content or ""
 
-        # 4) Persist assistant reply
-        assistant_msg = await message_service.create_assistant_message(client, chat_id, model_to_use, assistant_content)
+        # 4) Persist the user message and assistant reply together
+        assistant_msg = await message_service.create_exchange(
+            client, chat_id, msg_in.content, model_to_use, assistant_content
+        )
+        if assistant_content and cacheable:
+            _remember_history(
+                chat_id, assistant_msg["id"], [*messages_payload, {"role": "assistant", "content": assistant_content}]
+            )
 
-        return MessageRead.model_validate(assistant_msg)
+        return assistant_msg
     finally:
-        _chat_busy[str(chat_id)] = False
+        if title_task is not None:
+            await title_task
+        await chat_state.release(str(chat_id), lock_token)
 
 
 @router.get("/{chat_id}/messages", response_model=List[MessageRead])
 async def list_messages(
     chat_id: uuid.UUID,
+    response: Response,
     current_user: Annotated[UserOut, Depends(get_current_user)],
     client: SupabaseClient = Depends(get_supabase_client),
+    limit: Optional[int] = Query(None, ge=1, le=_MAX_PAGE_SIZE),
+    before: Optional[str] = None,
 ):
-    """Return all messages for a chat ordered by creation time ascending."""
-    rows = await message_service.list_messages(client, chat_id)
+    """Return all messages for a chat ordered by creation time ascending.
+
+    With ``limit`` only the newest page older than the ``before`` cursor is
+    returned (still ascending); the next cursor is sent in ``X-Next-Cursor``.
+    """
+    rows = await message_service.list_messages(client, chat_id, limit=limit, before=_parse_cursor(before))
+    if limit is not None and len(rows) == limit:
+        response.headers[_NEXT_CURSOR_HEADER] = encode_cursor(rows[0])
     if not rows:
         chat_row = await chat_service.get_chat(client, chat_id)
         if chat_row is None or chat_row["user_id"] != str(current_user.id):
             raise HTTPException(status_code=404, detail="Chat not found")
-    msg_dtos: list[MessageRead] = []
+    # Look up all referenced channels in a single batch
+    channel_ids = {r["channel_id"] for r in rows if r.get("channel_id")}
+    chans = await get_channel_statuses(client, channel_ids) if channel_ids else []
+    chan_by_id = {str(chan["id"]): chan for chan in chans}
+
+    # Plain dicts: response_model validates them once on the way out
+    msg_dtos: list[dict] = []
     for r in rows:
-        dto_dict = r.copy()
-        if r.get("channel_id"):
-            chan = await get_channel_status(client, r["channel_id"])
-            if chan:
-                dto_dict["channel"] = chan
-        msg_dtos.append(MessageRead.model_validate(dto_dict))
+        chan = chan_by_id.get(r.get("channel_id"))
+        msg_dtos.append({**r, "channel": chan} if chan else r)
     return msg_dtos
 
 
+@router.get("/{chat_id}/messages/events")
+async def stream_messages(
+    chat_id: uuid.UUID,
+    current_user: Annotated[UserOut, Depends(get_current_user)],
+    client: SupabaseClient = Depends(get_supabase_client),
+):
+    """Send a chat's messages as Server-Sent Events, oldest first.
+
+    Each ``data:`` event is one `MessageRead`; messages are fetched in pages,
+    so the first ones arrive before the whole history is read. A final
+    ``end`` event marks the last message.
+    """
+    row = await chat_service.get_chat(client, chat_id)
+    if row is None or row["user_id"] != str(current_user.id):
+        raise HTTPException(status_code=404, detail="Chat not found")
+
+    async def _events():
+        async for rows in message_service.iter_message_pages(client, chat_id, _STREAM_PAGE_SIZE):
+            channel_ids = {r["channel_id"] for r in rows if r.get("channel_id")}
+            chans = await get_channel_statuses(client, channel_ids) if channel_ids else []
+            chan_by_id = {str(chan["id"]): chan for chan in chans}
+            for r in rows:
+                # Validated like the list endpoint's response_model (drops the channel log)
+                message = MessageRead.model_validate({**r, "channel": chan_by_id.get(r.get("channel_id"))})
+                yield b"data: " + message.model_dump_json().encode() + b"\n\n"
+        yield b"event: end\ndata: {}\n\n"
+
+    return StreamingResponse(_events(), media_type="text/event-stream", headers=_STREAM_HEADERS)
+
+
 @router.post("/{chat_id}/cancel", status_code=status.HTTP_202_ACCEPTED)
 async def cancel_chat(
     chat_id: uuid.UUID,
@@ -357,8 +541,6 @@ async def cancel_chat(
     if row_chat is None or row_chat["user_id"] != str(current_user.id):
         raise HTTPException(status_code=404, detail="Chat not found")
 
-    fut = _chat_futures.get(str(chat_id))
-    if fut and not fut.done():
-        fut.cancel()
-    _chat_busy[str(chat_id)] = False
+    # The cancelled request frees the chat itself once it has unwound
+    await get_chat_state().request_cancel(str(chat_id))
     return {"status": "cancellation_requested"}
@@ -5,17 +5,25 @@ Supports:
 - Case-insensitive substring search via the `q` query parameter.
 - Optional `force_refresh` (bool) parameter for admins/tests to bypass the
   cache. **Not intended for production clients.**
+- HTTP caching: ``Cache-Control`` plus an ``ETag`` per page, honouring
+  ``If-None-Match`` with 304 Not Modified.
 """
 from __future__ import annotations
 
-from typing import Any, List
+import hashlib
+from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 
-from ..services.model_service import get_models
+from ..services.model_service import get_model_index, search_models
 
 router = APIRouter(prefix="/models", tags=["models"])
 
+# The list only changes when the OpenRouter catalogue is refreshed (every few
+# hours), so browsers may reuse a page briefly and revalidate it in the background.
+_CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=300"
+
 
 class PaginatedModelsResponse(dict):
     """Typed response helper returned by the `/models` endpoint."""
@@ -23,24 +31,24 @@ class PaginatedModelsResponse(dict):
 
 @router.get("/", response_model=Any, status_code=status.HTTP_200_OK)
 async def list_models(
+    request: Request,
     page: int = Query(1, ge=1, description="Page number (1-indexed)"),
     limit: int = Query(20, ge=1, le=100, description="Number of models per page"),
     q: str | None = Query(None, description="Case-insensitive substring search"),
     force_refresh: bool = Query(False, description="Bypass cache – for admins/testing"),
-) -> dict[str, Any]:
-    """Return a paginated list of models with optional search."""
-
-    # Retrieve (and maybe refresh) the cached models list.
-    models_raw: Any = await get_models(force_refresh=force_refresh)
-    # Safety: ensure *models* is a list even if service returns a dict
-    models: List[dict[str, Any]] = (
-        list(models_raw.values()) if isinstance(models_raw, dict) else list(models_raw)
-    )
+) -> Response:
+    """Return a paginated list of models with optional search.
+
+    Responses carry an ``ETag``; a matching ``If-None-Match`` gets a 304.
+    """
+
+    # Retrieve (and maybe refresh) the cached models list and search keys.
+    index = await get_model_index(force_refresh=force_refresh)
+    models = index.models
 
     # Apply search filter if provided.
     if q:
-        needle = q.lower()
-        models = [m for m in models if needle in str(m.get("id", "")).lower() or needle in str(m.get("name", "")).lower()]
+        models = search_models(index, q)
 
     total = len(models)
 
@@ -53,10 +61,18 @@ async def list_models(
 
     results = models[start:end]
 
-    return {
-        "total": total,
-        "page": page,
-        "page_size": limit,
-        "default_model": models[0] if models else None,
-        "results": results,
-    }
+    body = orjson.dumps(
+        {
+            "total": total,
+            "page": page,
+            "page_size": limit,
+            "default_model": models[0] if models else None,
+            "results": results,
+        }
+    )
+    # Serialised once and hashed; blake2 is plenty for a cache validator.
+    etag = f'"{hashlib.blake2s(body, digest_size=8).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": _CACHE_CONTROL}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -6,7 +6,7 @@ import uuid
 from typing import List, Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from supabase import Client as SupabaseClient
+from supabase import AsyncClient as SupabaseClient
 
 from ..db.supabase_client import get_supabase_client
 from ..services import consensus_profile_service as profile_service
@@ -34,7 +34,7 @@ async def create_profile(
     client: SupabaseClient = Depends(get_supabase_client),
 ):
     row = await profile_service.create_profile(client, current_user.id, profile_in.model_dump())
-    return ConsensusProfileRead.model_validate(row)
+    return row
 
 
 @router.get("", response_model=List[ConsensusProfileRead])
@@ -43,7 +43,8 @@ async def list_profiles(
     client: SupabaseClient = Depends(get_supabase_client),
 ):
     rows = await profile_service.list_profiles(client, current_user.id)
-    return [ConsensusProfileRead.model_validate(r) for r in rows]
+    # Plain rows: response_model validates them once on the way out
+    return rows
 
 
 @router.get("/{profile_id}", response_model=ConsensusProfileRead)
@@ -55,7 +56,7 @@ async def get_profile(
     row = await profile_service.get_profile(client, profile_id, current_user.id)
     if row is None:
         raise HTTPException(status_code=404, detail="Profile not found")
-    return ConsensusProfileRead.model_validate(row)
+    return row
 
 
 @router.patch("/{profile_id}", response_model=ConsensusProfileRead)
@@ -69,7 +70,7 @@ async def update_profile(
     row = await profile_service.update_profile(client, profile_id, current_user.id, updates)
     if row is None:
         raise HTTPException(status_code=404, detail="Profile not found")
-    return ConsensusProfileRead.model_validate(row)
+    return row
 
 
 @router.delete("/{profile_id}", status_code=status.HTTP_204_NO_CONTENT)
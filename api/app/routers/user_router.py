@@ -2,13 +2,14 @@
 from __future__ import annotations
 
 import logging
+import time
+from collections import OrderedDict
 from datetime import timedelta
-from uuid import UUID
-from typing import Annotated, List
+from typing import Annotated, List, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from supabase import Client as SupabaseClient
+from supabase import AsyncClient as SupabaseClient
 
 from app.db.supabase_client import get_supabase_client
 from app.schemas.user import UserCreate, UserLogin, UserOut, Token
@@ -21,6 +22,13 @@ router = APIRouter(prefix="/users", tags=["users"])
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/login")
 
+# Authenticated users keyed by id, so a session's requests do not each re-read
+# the users row. Entries expire quickly and are dropped when the account is
+# deleted through this process.
+_USER_CACHE_TTL = 30.0  # seconds
+_USER_CACHE_SIZE = 10_000
+_user_cache: OrderedDict[str, Tuple[float, UserOut]] = OrderedDict()
+
 
 # ---------------------------------------------------------------------------
 # Dependencies
@@ -37,10 +45,21 @@ async def get_current_user(
     except ValueError:
         raise HTTPException(status_code=401, detail="Invalid credentials") from None
 
+    key = str(payload.sub)
+    cached = _user_cache.get(key)
+    if cached is not None and cached[0] > time.monotonic():
+        _user_cache.move_to_end(key)
+        return cached[1]
+
     user = await user_service.get_user_by_id(client, payload.sub)
     if user is None:
         raise HTTPException(status_code=401, detail="User not found")
-    return UserOut.model_validate(user)
+    current_user = UserOut.model_validate(user)
+    _user_cache[key] = (time.monotonic() + _USER_CACHE_TTL, current_user)
+    _user_cache.move_to_end(key)
+    while len(_user_cache) > _USER_CACHE_SIZE:
+        _user_cache.popitem(last=False)
+    return current_user
 
 
 # ---------------------------------------------------------------------------
@@ -51,12 +70,10 @@ async def get_current_user(
 @router.post("/register", response_model=UserOut, status_code=status.HTTP_201_CREATED)
 async def register(user_in: UserCreate, client: SupabaseClient = Depends(get_supabase_client)):
     """Register a new user account."""
-    existing = await user_service.get_user_by_email(client, user_in.email)
-    if existing:
-        raise HTTPException(status_code=400, detail="Email already registered")
-
     user = await user_service.create_user(client, user_in.email, user_in.password)
-    return UserOut.model_validate(user)
+    if user is None:
+        raise HTTPException(status_code=400, detail="Email already registered")
+    return user
 
 
 @router.post("/login", response_model=Token)
@@ -65,11 +82,18 @@ async def login(form_data: Annotated[OAuth2PasswordRequestForm, Depends()], clie
     user = await user_service.get_user_by_email(client, form_data.username)
     # Supabase returns a plain dict; extract hashed password safely
     hashed_pw = user.get("hashed_password") if user else None
-    if user is None or hashed_pw is None or not auth_service.verify_password(form_data.password, hashed_pw):
+    if user is None or hashed_pw is None:
+        raise HTTPException(status_code=401, detail="Incorrect email or password")
+    verified, new_hash = await auth_service.verify_password(form_data.password, hashed_pw)
+    if not verified:
         raise HTTPException(status_code=401, detail="Incorrect email or password")
+    if new_hash:
+        # Stored hash used a deprecated scheme (bcrypt); upgrade it transparently
+        await user_service.update_password_hash(client, user["id"], new_hash)
 
     access_token_expires = timedelta(minutes=auth_service.ACCESS_TOKEN_EXPIRE_MINUTES)
-    token = auth_service.create_access_token(UUID(user["id"]), access_token_expires)
+    # Supabase returns the id already in canonical string form; pass it through
+    token = auth_service.create_access_token(user["id"], access_token_expires)
     return Token(access_token=token, token_type="bearer", expires_in=int(access_token_expires.total_seconds()))
 
 
@@ -90,4 +114,5 @@ async def delete_current_user(
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
     await user_service.delete_user(client, current_user.id)
+    _user_cache.pop(str(current_user.id), None)
     return None
@@ -3,25 +3,30 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 from typing import Optional, List
+from app.schemas.common import ShortStr
 from app.schemas.consensus_channel import ConsensusChannelRead
-from pydantic import BaseModel, Field, constr, ConfigDict
-from app.schemas.message import MessageRead
+from pydantic import BaseModel, Field, ConfigDict
+from app.schemas.message import MessagePreview, MessageRead
 
 class ChatBase(BaseModel):
-    name: Optional[constr(strip_whitespace=True, max_length=120)] = Field(
+    name: Optional[ShortStr] = Field(
         None, description="Optional display name for the chat room."
     )
-    default_model: constr(strip_whitespace=True, max_length=120) = Field(
+    default_model: ShortStr = Field(
         ..., description="The default LLM model used for assistant replies."
     )
 
 class ChatCreate(ChatBase):
     """Payload for creating a new chat."""
 
+    model_config = ConfigDict(extra="forbid")
+
 class ChatUpdate(BaseModel):
     """Partial update for an existing chat."""
-    name: Optional[constr(strip_whitespace=True, max_length=120)] = None
-    default_model: Optional[constr(strip_whitespace=True, max_length=120)] = None
+    name: Optional[ShortStr] = None
+    default_model: Optional[ShortStr] = None
+
+    model_config = ConfigDict(extra="forbid")
 
 class ChatRead(BaseModel):
     """Representation of a chat returned to API consumers."""
@@ -33,6 +38,14 @@ class ChatRead(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+class ChatListItem(ChatRead):
+    """Chat as listed in the sidebar, optionally with its latest consensus channel
+    and last message."""
+
+    latest_channel: Optional[ConsensusChannelRead] = None
+    last_message: Optional[MessagePreview] = None
+
+
 class ChatWithMessages(ChatRead):
     """Chat including its associated messages (ordered by timestamp).
     NOTE: Do NOT use from_attributes here, as messages must always be set explicitly in the endpoint to avoid async SQLAlchemy lazy loading errors.
@@ -0,0 +1,7 @@
+"""Field types shared by several schema modules."""
+from typing import Annotated
+
+from pydantic import StringConstraints
+
+# Names and model ids: trimmed, at most 120 characters (DB column limit)
+ShortStr = Annotated[str, StringConstraints(strip_whitespace=True, max_length=120)]
@@ -5,26 +5,32 @@ import uuid
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel, Field, constr, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict
+
+from app.schemas.common import ShortStr
 
 
 class ConsensusProfileBase(BaseModel):
-    name: constr(strip_whitespace=True, max_length=120) = Field(..., description="Display name for the template")
-    guiding_model: constr(strip_whitespace=True, max_length=120)
-    participant_models: List[constr(strip_whitespace=True, max_length=120)]
+    name: ShortStr = Field(..., description="Display name for the template")
+    guiding_model: ShortStr
+    participant_models: List[ShortStr]
     max_rounds: int = Field(..., ge=1, le=32)
 
 
 class ConsensusProfileCreate(ConsensusProfileBase):
     """Payload for creating a profile."""
 
+    model_config = ConfigDict(extra="forbid")
+
 
 class ConsensusProfileUpdate(BaseModel):
-    name: Optional[constr(strip_whitespace=True, max_length=120)] = None
-    guiding_model: Optional[constr(strip_whitespace=True, max_length=120)] = None
-    participant_models: Optional[List[constr(strip_whitespace=True, max_length=120)]] = None
+    name: Optional[ShortStr] = None
+    guiding_model: Optional[ShortStr] = None
+    participant_models: Optional[List[ShortStr]] = None
     max_rounds: Optional[int] = Field(None, ge=1, le=32)
 
+    model_config = ConfigDict(extra="forbid")
+
 
 class ConsensusProfileRead(ConsensusProfileBase):
     id: uuid.UUID
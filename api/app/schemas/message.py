@@ -18,12 +18,21 @@ class UserMessageCreate(BaseModel):
         description="Whether to use consensus mode for the assistant response."
     )
     guiding_model: Optional[str] = Field(None, description="Model for guiding agent (if consensus)")
-    participant_models: Optional[list[str]] = Field(None, description="Participant agent models (if consensus)")
+    participant_models: Optional[list[str]] = Field(
+        None,
+        description="Participant agent models (if consensus); empty means the chat's default model",
+    )
     max_rounds: Optional[int] = Field(8, ge=1, le=20, description="Max consensus rounds")
     profile_id: Optional[uuid.UUID] = Field(
         None,
         description="ID of a saved consensus profile to apply (overrides guiding/participants/max_rounds).",
     )
+    cache_bypass: bool = Field(
+        False,
+        description="Force a fresh generation instead of serving a cached response.",
+    )
+
+    model_config = ConfigDict(extra="forbid")
 
 class MessageRead(BaseModel):
     """Representation of a stored message returned to the client."""
@@ -38,3 +47,10 @@ class MessageRead(BaseModel):
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class MessagePreview(BaseModel):
+    """Latest message of a chat, shown under its name in the chat list."""
+    role: str
+    content: str
+    created_at: datetime
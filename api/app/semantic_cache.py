@@ -0,0 +1,84 @@
+"""Semantic cache for final *Channel* answers.
+
+A full consensus run costs (N+1) × rounds LLM calls, but many tasks are mere
+paraphrases of ones we have already answered. This cache embeds the task and
+returns a previous consensus answer when a stored task is close enough in
+embedding space (cosine similarity of at least 0.87) **and** was discussed in
+the same scope (the chat it was asked in) by the exact same set of models.
+Channels only ever see the task itself, never the chat's earlier turns, so an
+answer depends on nothing but the task and the panel; scoping keeps answers
+from being shared between chats (and so between users).
+
+Entries live in process memory (bounded, oldest evicted first). Similarity is
+plain cosine over the vectors returned by the configured embedding model
+(``CONSENSUS_EMBEDDING_MODEL``, default ``openai/text-embedding-3-small``).
+"""
+from __future__ import annotations
+
+import math
+import os
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Deque, Iterable, List, Optional
+
+from .agent import Agent
+
+__all__ = ["SemanticCache", "get_semantic_cache", "models_signature"]
+
+_DEFAULT_EMBEDDING_MODEL = "openai/text-embedding-3-small"
+
+
+def models_signature(guiding_model: str, participant_models: Iterable[str]) -> str:
+    """Identify a panel independent of participant order."""
+    return guiding_model + "|" + ",".join(sorted(participant_models))
+
+
+def _cosine(a: List[float], b: List[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+@dataclass
+class _Entry:
+    embedding: List[float]
+    key: str
+    answer: str
+
+
+class SemanticCache:
+    """Nearest-neighbour lookup of consensus answers by task embedding."""
+
+    def __init__(self, embedder: Agent, max_distance: float = 0.13, maxsize: int = 1024) -> None:
+        self.embedder = embedder
+        self.max_distance = max_distance
+        self._entries: Deque[_Entry] = deque(maxlen=maxsize)
+
+    async def embed(self, task: str) -> Optional[List[float]]:
+        return await self.embedder.aembed(task)
+
+    def lookup(self, embedding: List[float], key: str) -> Optional[str]:
+        """Return the closest answer cached under *key* within *max_distance*, if any.
+
+        *key* combines the cache scope and `models_signature`.
+        """
+        best: Optional[_Entry] = None
+        best_distance = self.max_distance
+        for entry in self._entries:
+            if entry.key != key:
+                continue
+            distance = 1.0 - _cosine(embedding, entry.embedding)
+            if distance < best_distance:
+                best, best_distance = entry, distance
+        return best.answer if best else None
+
+    def store(self, embedding: List[float], key: str, answer: str) -> None:
+        self._entries.append(_Entry(embedding, key, answer))
+
+
+@lru_cache(maxsize=1)
+def get_semantic_cache() -> SemanticCache:
+    """Return the process-wide semantic cache."""
+    model = os.getenv("CONSENSUS_EMBEDDING_MODEL", _DEFAULT_EMBEDDING_MODEL)
+    return SemanticCache(Agent(model))
@@ -1,9 +1,12 @@
 """Service layer for authentication utilities (password hashing & JWT tokens)."""
+import asyncio
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional
 from uuid import UUID
 
-from jose import JWTError, jwt
+import jwt
 from passlib.context import CryptContext
 
 from app.schemas.user import TokenPayload
@@ -16,26 +19,40 @@ SECRET_KEY = "CHANGE_ME_SUPER_SECRET_KEY"  # In production, set via env var
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 1 week
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# New hashes use argon2id; existing bcrypt hashes still verify and are
+# upgraded on the user's next login (see `verify_password`).
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=2,
+    argon2__memory_cost=65536,
+    argon2__parallelism=1,
+)
 
 
 # ---------------------------------------------------------------------------
 # Password utilities
 # ---------------------------------------------------------------------------
+# Hashing is deliberately slow CPU work (tens of ms), so it runs in a worker
+# thread to keep the event loop serving other requests.
 
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+async def get_password_hash(password: str) -> str:
+    return await asyncio.to_thread(pwd_context.hash, password)
 
 
-def verify_password(password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(password, hashed_password)
+async def verify_password(password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    """Return whether *password* matches, plus a replacement hash when the
+    stored one uses a deprecated scheme (None otherwise)."""
+    return await asyncio.to_thread(pwd_context.verify_and_update, password, hashed_password)
 
 
 # ---------------------------------------------------------------------------
 # JWT utilities
 # ---------------------------------------------------------------------------
 
-def create_access_token(subject: UUID, expires_delta: Optional[timedelta] = None) -> str:
+def create_access_token(subject: UUID | str, expires_delta: Optional[timedelta] = None) -> str:
+    """Return a signed token for *subject* (a user id, as a UUID or its string form)."""
     if expires_delta is None:
         expires_delta = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     expire = datetime.utcnow() + expires_delta
@@ -44,9 +61,30 @@ def create_access_token(subject: UUID, expires_delta: Optional[timedelta] = None
     return encoded_jwt
 
 
+# A client sends the same token with every request, so verified payloads are
+# kept (until they expire) instead of re-running HMAC + JSON parsing each time.
+_TOKEN_CACHE_SIZE = 4096
+_token_cache: "OrderedDict[str, TokenPayload]" = OrderedDict()
+
+
 def parse_token(token: str) -> TokenPayload:
+    cached = _token_cache.get(token)
+    if cached is not None:
+        if cached.exp > time.time():
+            _token_cache.move_to_end(token)
+            return cached
+        del _token_cache[token]
+        raise ValueError("Invalid token")
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return TokenPayload.model_validate(payload)
-    except JWTError as e:
+        payload = jwt.decode(
+            token, SECRET_KEY, algorithms=[ALGORITHM], options={"require": ["exp", "sub"]}
+        )
+        parsed = TokenPayload.model_validate(payload)
+    except jwt.InvalidTokenError as e:
         raise ValueError("Invalid token") from e
+
+    _token_cache[token] = parsed
+    if len(_token_cache) > _TOKEN_CACHE_SIZE:
+        _token_cache.popitem(last=False)
+    return parsed
@@ -5,43 +5,70 @@ added in a later pass when we refactor the message endpoints in *chat_router*.
 """
 from __future__ import annotations
 
-import asyncio
 import uuid
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
-from supabase import Client as SupabaseClient
+from postgrest import CountMethod, ReturnMethod
+from supabase import AsyncClient as SupabaseClient
+
+from .pagination import Cursor, before_filter
 
 CHAT_TABLE = "chats"
+# Embedded resource returning each chat's newest message (PostgREST runs it as
+# a LATERAL join, so the preview costs no extra request)
+_LAST_MESSAGE_EMBED = "messages(role,content,created_at)"
 
 # ---------------------------------------------------------------------------
-# Low-level wrappers (blocking SDK) – executed in background threads
+# Low-level wrappers around the async SDK
 # ---------------------------------------------------------------------------
 
-def _insert_chat(client: SupabaseClient, payload: Dict[str, Any]) -> Dict[str, Any]:
-    resp = client.table(CHAT_TABLE).insert(payload).execute()
+async def _insert_chat(client: SupabaseClient, payload: Dict[str, Any]) -> Dict[str, Any]:
+    resp = await client.table(CHAT_TABLE).insert(payload).execute()
     return resp.data[0] if resp.data else None
 
 
-def _select_chats_by_user(client: SupabaseClient, user_id: uuid.UUID) -> List[Dict[str, Any]]:
-    resp = (
-        client.table(CHAT_TABLE)
-        .select("*")
-        .eq("user_id", str(user_id))
-        .order("created_at", desc=True)
-        .execute()
-    )
+async def _select_chats_by_user(
+    client: SupabaseClient,
+    user_id: uuid.UUID,
+    limit: Optional[int] = None,
+    before: Optional[Cursor] = None,
+    with_last_message: bool = False,
+) -> List[Dict[str, Any]]:
+    if with_last_message:
+        query = (
+            client.table(CHAT_TABLE)
+            .select(f"*,{_LAST_MESSAGE_EMBED}")
+            .order("created_at", desc=True, foreign_table="messages")
+            .order("id", desc=True, foreign_table="messages")
+            .limit(1, foreign_table="messages")
+        )
+    else:
+        query = client.table(CHAT_TABLE).select("*")
+    query = query.eq("user_id", str(user_id))
+    if before is not None:
+        query = query.or_(before_filter(before))
+    query = query.order("created_at", desc=True).order("id", desc=True)
+    if limit is not None:
+        query = query.limit(limit)
+    resp = await query.execute()
     return resp.data or []
 
 
-def _select_chat(client: SupabaseClient, chat_id: uuid.UUID) -> Dict[str, Any] | None:
-    resp = client.table(CHAT_TABLE).select("*").eq("id", str(chat_id)).limit(1).execute()
+async def _select_chat(client: SupabaseClient, chat_id: uuid.UUID) -> Dict[str, Any] | None:
+    resp = await client.table(CHAT_TABLE).select("*").eq("id", str(chat_id)).limit(1).execute()
     return resp.data[0] if resp.data else None
 
 
-def _update_chat(client: SupabaseClient, chat_id: uuid.UUID, user_id: uuid.UUID, updates: Dict[str, Any]) -> Dict[str, Any] | None:
-    resp = (
+async def _update_chat(
+    client: SupabaseClient,
+    chat_id: uuid.UUID,
+    user_id: uuid.UUID,
+    updates: Dict[str, Any],
+    returning: ReturnMethod = ReturnMethod.representation,
+) -> Dict[str, Any] | None:
+    resp = await (
         client.table(CHAT_TABLE)
-        .update(updates)
+        .update(updates, returning=returning)
         .eq("id", str(chat_id))
         .eq("user_id", str(user_id))
         .execute()
@@ -49,16 +76,17 @@ def _update_chat(client: SupabaseClient, chat_id: uuid.UUID, user_id: uuid.UUID,
     return resp.data[0] if resp.data else None
 
 
-def _delete_chat(client: SupabaseClient, chat_id: uuid.UUID, user_id: uuid.UUID) -> bool:
+async def _delete_chat(client: SupabaseClient, chat_id: uuid.UUID, user_id: uuid.UUID) -> bool:
     """Return True when at least one row matches and is deleted."""
-    resp = (
+    resp = await (
         client.table(CHAT_TABLE)
-        .delete()
+        .delete(count=CountMethod.exact, returning=ReturnMethod.minimal)
         .eq("id", str(chat_id))
         .eq("user_id", str(user_id))
         .execute()
     )
-    return bool(resp.data)
+    # Affected rows come back in Content-Range; the deleted row is not echoed
+    return bool(resp.count)
 
 # ---------------------------------------------------------------------------
 # Public async helpers
@@ -66,20 +94,41 @@ def _delete_chat(client: SupabaseClient, chat_id: uuid.UUID, user_id: uuid.UUID)
 
 async def create_chat(client: SupabaseClient, user_id: uuid.UUID, data: Dict[str, Any]):
     payload = {"user_id": str(user_id), **data}
-    return await asyncio.to_thread(_insert_chat, client, payload)
+    return await _insert_chat(client, payload)
+
 
+async def list_chats(
+    client: SupabaseClient,
+    user_id: uuid.UUID,
+    *,
+    limit: Optional[int] = None,
+    before: Optional[Cursor] = None,
+    with_last_message: bool = False,
+):
+    """Return the user's chats, newest first (at most *limit*, before the *before* cursor).
 
-async def list_chats(client: SupabaseClient, user_id: uuid.UUID):
-    return await asyncio.to_thread(_select_chats_by_user, client, user_id)
+    With *with_last_message* each row also carries ``last_message`` (or None),
+    fetched in the same request.
+    """
+    rows = await _select_chats_by_user(client, user_id, limit, before, with_last_message)
+    if with_last_message:
+        for row in rows:
+            row["last_message"] = next(iter(row.pop("messages", None) or []), None)
+    return rows
 
 
 async def get_chat(client: SupabaseClient, chat_id: uuid.UUID):
-    return await asyncio.to_thread(_select_chat, client, chat_id)
+    return await _select_chat(client, chat_id)
 
 
 async def update_chat(client: SupabaseClient, chat_id: uuid.UUID, user_id: uuid.UUID, updates: Dict[str, Any]):
-    return await asyncio.to_thread(_update_chat, client, chat_id, user_id, updates)
+    return await _update_chat(client, chat_id, user_id, updates)
+
+
+async def rename_chat(client: SupabaseClient, chat_id: uuid.UUID, user_id: uuid.UUID, name: str) -> None:
+    """Set the chat's *name* (nothing reads the updated row back)."""
+    await _update_chat(client, chat_id, user_id, {"name": name}, returning=ReturnMethod.minimal)
 
 
 async def delete_chat(client: SupabaseClient, chat_id: uuid.UUID, user_id: uuid.UUID) -> bool:
-    return await asyncio.to_thread(_delete_chat, client, chat_id, user_id)
+    return await _delete_chat(client, chat_id, user_id)
@@ -1,27 +1,42 @@
 """Supabase-backed CRUD helpers for **ConsensusProfile** rows."""
 from __future__ import annotations
 
-import asyncio
+import time
 import uuid
-from typing import Any, Dict, List
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
 
-from supabase import Client as SupabaseClient
+from postgrest import CountMethod, ReturnMethod
+from supabase import AsyncClient as SupabaseClient
 
 _TABLE = "consensus_profiles"
+# Exactly the columns of ConsensusProfileRead (list responses skip user_id etc.)
+_READ_COLUMNS = "id,name,guiding_model,participant_models,max_rounds,created_at,updated_at"
+
+# Profiles rarely change, so each user's list is kept for a short while and
+# dropped whenever this process changes one of their profiles. The TTL bounds
+# staleness for writes made through another worker.
+_LIST_CACHE_TTL = 30.0  # seconds
+_LIST_CACHE_SIZE = 10_000
+_list_cache: OrderedDict[str, Tuple[float, List[Dict[str, Any]]]] = OrderedDict()
+
+
+def _invalidate(user_id: uuid.UUID) -> None:
+    _list_cache.pop(str(user_id), None)
 
 # ---------------------------------------------------------------------------
-# Helper wrappers that run synchronous SDK methods off the event loop thread.
+# Helper wrappers around the async SDK query builder.
 # ---------------------------------------------------------------------------
 
-def _insert(client: SupabaseClient, payload: Dict[str, Any]) -> Dict[str, Any]:
-    resp = client.table(_TABLE).insert(payload).execute()
+async def _insert(client: SupabaseClient, payload: Dict[str, Any]) -> Dict[str, Any]:
+    resp = await client.table(_TABLE).insert(payload).execute()
     return resp.data[0] if resp.data else None
 
 
-def _select_by_user(client: SupabaseClient, user_id: uuid.UUID) -> List[Dict[str, Any]]:
-    resp = (
+async def _select_by_user(client: SupabaseClient, user_id: uuid.UUID) -> List[Dict[str, Any]]:
+    resp = await (
         client.table(_TABLE)
-        .select("*")
+        .select(_READ_COLUMNS)
         .eq("user_id", str(user_id))
         .order("created_at", desc=True)
         .execute()
@@ -29,8 +44,8 @@ def _select_by_user(client: SupabaseClient, user_id: uuid.UUID) -> List[Dict[str
     return resp.data or []
 
 
-def _select_one(client: SupabaseClient, profile_id: uuid.UUID, user_id: uuid.UUID) -> Dict[str, Any] | None:
-    resp = (
+async def _select_one(client: SupabaseClient, profile_id: uuid.UUID, user_id: uuid.UUID) -> Dict[str, Any] | None:
+    resp = await (
         client.table(_TABLE)
         .select("*")
         .eq("id", str(profile_id))
@@ -41,8 +56,8 @@ def _select_one(client: SupabaseClient, profile_id: uuid.UUID, user_id: uuid.UUI
     return resp.data[0] if resp.data else None
 
 
-def _update(client: SupabaseClient, profile_id: uuid.UUID, user_id: uuid.UUID, updates: Dict[str, Any]) -> Dict[str, Any] | None:
-    resp = (
+async def _update(client: SupabaseClient, profile_id: uuid.UUID, user_id: uuid.UUID, updates: Dict[str, Any]) -> Dict[str, Any] | None:
+    resp = await (
         client.table(_TABLE)
         .update(updates)
         .eq("id", str(profile_id))
@@ -52,14 +67,17 @@ def _update(client: SupabaseClient, profile_id: uuid.UUID, user_id: uuid.UUID, u
     return resp.data[0] if resp.data else None
 
 
-def _delete(client: SupabaseClient, profile_id: uuid.UUID, user_id: uuid.UUID) -> int:
-    resp = (
+async def _delete(client: SupabaseClient, profile_id: uuid.UUID, user_id: uuid.UUID) -> int:
+    """Return the number of deleted rows (read from the DELETE's own response)."""
+    resp = await (
         client.table(_TABLE)
-        .delete()
+        .delete(count=CountMethod.exact, returning=ReturnMethod.minimal)
         .eq("id", str(profile_id))
         .eq("user_id", str(user_id))
         .execute()
     )
+    # PostgREST reports the affected row count in Content-Range, so the
+    # deleted rows need not be echoed back.
     return resp.count or 0
 
 # ---------------------------------------------------------------------------
@@ -68,21 +86,37 @@ def _delete(client: SupabaseClient, profile_id: uuid.UUID, user_id: uuid.UUID) -
 
 async def create_profile(client: SupabaseClient, user_id: uuid.UUID, data: Dict[str, Any]):
     payload = {"user_id": str(user_id), **data}
-    return await asyncio.to_thread(_insert, client, payload)
+    row = await _insert(client, payload)
+    _invalidate(user_id)
+    return row
 
 
 async def list_profiles(client: SupabaseClient, user_id: uuid.UUID):
-    return await asyncio.to_thread(_select_by_user, client, user_id)
+    key = str(user_id)
+    cached = _list_cache.get(key)
+    if cached is not None and cached[0] > time.monotonic():
+        _list_cache.move_to_end(key)
+        return cached[1]
+
+    rows = await _select_by_user(client, user_id)
+    _list_cache[key] = (time.monotonic() + _LIST_CACHE_TTL, rows)
+    _list_cache.move_to_end(key)
+    while len(_list_cache) > _LIST_CACHE_SIZE:
+        _list_cache.popitem(last=False)
+    return rows
 
 
 async def get_profile(client: SupabaseClient, profile_id: uuid.UUID, user_id: uuid.UUID):
-    return await asyncio.to_thread(_select_one, client, profile_id, user_id)
+    return await _select_one(client, profile_id, user_id)
 
 
 async def update_profile(client: SupabaseClient, profile_id: uuid.UUID, user_id: uuid.UUID, updates: Dict[str, Any]):
-    return await asyncio.to_thread(_update, client, profile_id, user_id, updates)
+    row = await _update(client, profile_id, user_id, updates)
+    _invalidate(user_id)
+    return row
 
 
 async def delete_profile(client: SupabaseClient, profile_id: uuid.UUID, user_id: uuid.UUID) -> bool:
-    deleted = await asyncio.to_thread(_delete, client, profile_id, user_id)
+    deleted = await _delete(client, profile_id, user_id)
+    _invalidate(user_id)
     return deleted > 0
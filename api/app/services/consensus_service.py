@@ -7,88 +7,172 @@ logic remains identical.
 from __future__ import annotations
 
 import asyncio
+import os
 import uuid
-from concurrent.futures import ThreadPoolExecutor
-from typing import Dict, Any, List, Optional
+from contextlib import aclosing
+from functools import lru_cache
+from typing import AsyncIterator, Dict, Any, Iterable, List, Optional, Set
 from datetime import datetime, timezone
 
-from supabase import Client as SupabaseClient
+from postgrest import ReturnMethod
+from supabase import AsyncClient as SupabaseClient
 
 from app.channel import Channel, ChannelConfig
 from app.agent import Agent
+from app.status_store import get_status_store
 
 # ---------------------------------------------------------------------------
 # In-memory caches (per process)
 # ---------------------------------------------------------------------------
+# Live Channel objects stay in the worker running them; their status records
+# go through the (optionally Redis-backed) status store so any worker can
+# answer a poll.
 
 _channels: Dict[str, Channel] = {}
-_channel_status: Dict[str, Dict[str, Any]] = {}
-_executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=4)
+_tasks: Set[asyncio.Task] = set()
+# Queues of clients watching a channel run by this worker (see watch_channel)
+_watchers: Dict[str, Set[asyncio.Queue]] = {}
+
+_TERMINAL_STATUSES = {"finished", "error"}
+
+# At most this many discussions call the LLMs at once (CONSENSUS_MAX_CHANNELS
+# overrides); later ones wait as "pending", and beyond the backlog new
+# channels are refused. Runs are network-bound, so the cap only has to protect
+# the OpenRouter quota, not the CPU.
+_DEFAULT_MAX_RUNNING_CHANNELS = 32
+_MAX_WAITING_CHANNELS = 64
+_WATCH_POLL_INTERVAL = 2.0  # seconds, for channels running on another worker
 
 _TABLE = "consensus_channels"
-_MESSAGES_TABLE = "messages"
+_CHATS_TABLE = "chats"
+# Columns of a channel without its (large) discussion log
+_SUMMARY_COLUMNS = "id,chat_id,status,rounds_executed,answer,created_at,finished_at"
 
 # ---------------------------------------------------------------------------
 # Persistence helpers
 # ---------------------------------------------------------------------------
+# Nothing reads the written rows back, so ask PostgREST not to echo them
+# (the terminal UPDATE would otherwise return the whole discussion log).
 
 
-def _insert_row(client: SupabaseClient, payload: dict[str, Any]) -> None:
-    client.table(_TABLE).insert(payload).execute()
+async def _insert_row(client: SupabaseClient, payload: dict[str, Any]) -> None:
+    await client.table(_TABLE).insert(payload, returning=ReturnMethod.minimal).execute()
 
 
-def _update_row(client: SupabaseClient, channel_id: str, payload: dict[str, Any]) -> None:
-    client.table(_TABLE).update(payload).eq("id", channel_id).execute()
+async def _update_row(client: SupabaseClient, channel_id: str, payload: dict[str, Any]) -> None:
+    await (
+        client.table(_TABLE)
+        .update(payload, returning=ReturnMethod.minimal)
+        .eq("id", channel_id)
+        .execute()
+    )
 
 
-def _select_row(client: SupabaseClient, channel_id: str) -> dict[str, Any] | None:
-    resp = client.table(_TABLE).select("*").eq("id", channel_id).limit(1).execute()
+async def _select_row(client: SupabaseClient, channel_id: str) -> dict[str, Any] | None:
+    resp = await client.table(_TABLE).select("*").eq("id", channel_id).limit(1).execute()
     return resp.data[0] if resp.data else None
 
+
+async def _select_rows(client: SupabaseClient, channel_ids: List[str]) -> List[dict[str, Any]]:
+    resp = await client.table(_TABLE).select("*").in_("id", channel_ids).execute()
+    return resp.data or []
+
 # ---------------------------------------------------------------------------
-# Internal helpers (called from background thread)
+# Internal helpers (run as background tasks on the event loop)
 # ---------------------------------------------------------------------------
 
-def _run_channel(client: SupabaseClient, channel_id: str, chat_id: Optional[uuid.UUID], loop: asyncio.AbstractEventLoop) -> None:  # noqa: D401
-    """Blocking execution of *Channel.run()* inside ThreadPool."""
+async def _set_status(channel_id: str, status: Dict[str, Any]) -> None:
+    """Record *status* and push it to every local watcher of the channel."""
+    await get_status_store().set(channel_id, status)
+    for queue in _watchers.get(channel_id, ()):
+        queue.put_nowait(status)
+
+
+async def _status_record(client: SupabaseClient, channel_id: str) -> Dict[str, Any]:
+    """Return the channel's status record, rebuilt from its row if the store lost it.
+
+    The memory store evicts old records and the Redis store expires them, so a
+    channel that waited or ran for long may no longer have one.
+    """
+    status = await get_status_store().get(channel_id)
+    if status is not None:
+        return status
+    row = await _select_row(client, channel_id) or {}
+    return {
+        "id": channel_id,
+        "status": row.get("status", "pending"),
+        "rounds_executed": row.get("rounds_executed") or 0,
+        "answer": row.get("answer"),
+        "chat_id": row.get("chat_id"),
+        "created_at": row.get("created_at"),
+    }
+
+
+@lru_cache(maxsize=1)
+def _max_running_channels() -> int:
+    # Read on first use, after the lifespan has loaded .env
+    return max(1, int(os.getenv("CONSENSUS_MAX_CHANNELS", _DEFAULT_MAX_RUNNING_CHANNELS)))
+
+
+@lru_cache(maxsize=1)
+def _channel_slots() -> asyncio.Semaphore:
+    return asyncio.Semaphore(_max_running_channels())
+
+
+class ChannelCapacityError(RuntimeError):
+    """Raised by `spawn_channel` when the backlog of channels is full."""
+
+
+async def _run_channel(client: SupabaseClient, channel_id: str, chat_id: Optional[uuid.UUID]) -> None:  # noqa: D401
+    """Wait for a free slot, then run the channel."""
+    try:
+        async with _channel_slots():
+            await _drive_channel(client, channel_id, chat_id)
+    finally:
+        # The outcome now lives in the status store and Supabase; drop the
+        # Channel (and its full history) so memory does not grow per run.
+        _channels.pop(channel_id, None)
+
+
+async def _drive_channel(client: SupabaseClient, channel_id: str, chat_id: Optional[uuid.UUID]) -> None:
+    """Drive *Channel.run()* to completion and persist the outcome."""
     channel = _channels[channel_id]
-    _channel_status[channel_id]["status"] = "running"
+    status = await _status_record(client, channel_id)
+    status["status"] = "running"
+    await _set_status(channel_id, status)
     try:
-        answer = channel.run()
+        answer = await channel.run()
         log_payload = {agent.model: history for agent, history in channel._history.items()}
-        _channel_status[channel_id].update(
+        status.update(
             {
-                "id": channel_id,
-                "created_at": _channel_status[channel_id]["created_at"],
                 "status": "finished",
                 "rounds_executed": channel.rounds_executed,
                 "answer": answer,
                 "log": log_payload,
             }
         )
-        # Persist channel row async
-        loop.call_soon_threadsafe(
-            _update_row,
-            client,
-            channel_id,
-            {
-                "status": "finished",
-                "rounds_executed": channel.rounds_executed,
-                "answer": answer,
-                "log": log_payload,
-                "finished_at": "now()",  # postgres function evaluated server-side
-            },
-        )
-        # Schedule placeholder update on the main event-loop to avoid sharing the
-        # Supabase client between threads (httpx connection issues).
+        await _set_status(channel_id, status)
         from app.services import message_service  # local import to avoid circular
-        loop.call_soon_threadsafe(
-            asyncio.create_task,
+        # Persist the channel row and the chat's answer concurrently: they are
+        # independent writes, so finishing costs one round-trip instead of two.
+        await asyncio.gather(
+            _update_row(
+                client,
+                channel_id,
+                {
+                    "status": "finished",
+                    "rounds_executed": channel.rounds_executed,
+                    "answer": answer,
+                    "log": log_payload,
+                    "finished_at": "now()",  # postgres function evaluated server-side
+                },
+            ),
             message_service.fill_assistant_placeholder(client, channel_id, answer),
         )
     except Exception as exc:  # pylint: disable=broad-except
-        _channel_status[channel_id].update({"status": "error", "error": str(exc)})
-        loop.call_soon_threadsafe(_update_row, client, channel_id, {
+        status.update({"status": "error", "error": str(exc)})
+        await _set_status(channel_id, status)
+        await _update_row(client, channel_id, {
             "status": "error",
             "answer": str(exc),
         })
@@ -97,7 +181,7 @@ def _run_channel(client: SupabaseClient, channel_id: str, chat_id: Optional[uuid
 # Public API
 # ---------------------------------------------------------------------------
 
-async def spawn_channel(
+async def create_channel(
     *,
     client: SupabaseClient,
     task: str,
@@ -106,19 +190,33 @@ async def spawn_channel(
     max_rounds: int = 8,
     chat_id: uuid.UUID | None = None,
 ) -> str:
-    """Insert DB row, launch background discussion, return *channel_id*."""
+    """Insert DB row and register the discussion without starting it; return *channel_id*.
+
+    The caller launches it with `start_channel` (or abandons it with
+    `discard_channel`), so anything the run writes into can be stored first.
+    Semantic cache entries are scoped to *chat_id*; channels without a chat
+    never use that cache.
+
+    Raises `ChannelCapacityError` (before writing anything) when too many
+    channels are already running or waiting in this worker.
+    """
+    if len(_channels) >= _max_running_channels() + _MAX_WAITING_CHANNELS:
+        raise ChannelCapacityError("Too many consensus discussions in progress")
 
     channel_id = str(uuid.uuid4())
 
     # Build Channel object
     guiding_agent = Agent(guiding_model)
     participant_agents = [Agent(m) for m in participant_models]
-    config = ChannelConfig(max_rounds=max_rounds)
+    config = ChannelConfig(
+        max_rounds=max_rounds,
+        semantic_cache=os.getenv("CONSENSUS_SEMANTIC_CACHE") == "1",
+        cache_scope=str(chat_id) if chat_id else None,
+    )
     channel = Channel(task, guiding_agent, participant_agents, config)
 
-    # Persist row synchronously in thread pool to avoid blocking event loop
-    await asyncio.to_thread(
-        _insert_row,
+    # Persist row before the discussion starts so status polls can find it
+    await _insert_row(
         client,
         {
             "id": channel_id,
@@ -131,28 +229,181 @@ async def spawn_channel(
         },
     )
 
-    # Track in memory and launch background thread
+    # Track the channel; it counts towards the backlog until it ends
     _channels[channel_id] = channel
-    _channel_status[channel_id] = {
-        "id": channel_id,
-        "status": "pending",
-        "rounds_executed": 0,
-        "answer": None,
-        "chat_id": chat_id,
-        "created_at": datetime.now(timezone.utc).isoformat(),
-    }
+    await _set_status(
+        channel_id,
+        {
+            "id": channel_id,
+            "status": "pending",
+            "rounds_executed": 0,
+            "answer": None,
+            "chat_id": chat_id,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        },
+    )
+
+    return channel_id
 
-    loop = asyncio.get_event_loop()
-    loop.run_in_executor(_executor, _run_channel, client, channel_id, chat_id, loop)
 
+def start_channel(client: SupabaseClient, channel_id: str, chat_id: uuid.UUID | None = None) -> None:
+    """Launch a channel made by `create_channel` as a background task."""
+    task = asyncio.create_task(_run_channel(client, channel_id, chat_id))
+    # Hold a strong reference until the task completes so it is not GC'd mid-run.
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+async def discard_channel(client: SupabaseClient, channel_id: str, reason: str) -> None:
+    """Abandon a channel made by `create_channel` that will never be started."""
+    _channels.pop(channel_id, None)
+    status = await _status_record(client, channel_id)
+    status.update({"status": "error", "error": reason})
+    await _set_status(channel_id, status)
+    await _update_row(client, channel_id, {"status": "error", "answer": reason})
+
+
+async def spawn_channel(
+    *,
+    client: SupabaseClient,
+    task: str,
+    guiding_model: str,
+    participant_models: List[str],
+    max_rounds: int = 8,
+    chat_id: uuid.UUID | None = None,
+) -> str:
+    """Insert DB row, launch background discussion, return *channel_id*.
+
+    Raises `ChannelCapacityError` like `create_channel`.
+    """
+    channel_id = await create_channel(
+        client=client,
+        task=task,
+        guiding_model=guiding_model,
+        participant_models=participant_models,
+        max_rounds=max_rounds,
+        chat_id=chat_id,
+    )
+    start_channel(client, channel_id, chat_id)
     return channel_id
 
 
+def _is_current(channel_id: str, status: Dict[str, Any]) -> bool:
+    # A "pending" record may predate the row another worker has since updated;
+    # it is authoritative only while this worker runs the channel.
+    return status.get("status") != "pending" or channel_id in _channels
+
+
 async def get_channel_status(client: SupabaseClient, channel_id: str) -> Dict[str, Any] | None:
     """Return cached status or fetch from Supabase."""
-    cache = _channel_status.get(channel_id)
-    if cache and cache.get("status") != "pending":
+    cache = await get_status_store().get(channel_id)
+    if cache and _is_current(channel_id, cache):
         return cache
 
-    row = await asyncio.to_thread(_select_row, client, channel_id)
+    row = await _select_row(client, channel_id)
     return row
+
+
+async def get_channel_statuses(client: SupabaseClient, channel_ids: Iterable[str]) -> List[Dict[str, Any]]:
+    """Batch form of `get_channel_status`: one Supabase query for all cache misses.
+
+    Unknown ids are left out of the result.
+    """
+    ids = list(dict.fromkeys(channel_ids))
+    store = get_status_store()
+    cached = await asyncio.gather(*(store.get(cid) for cid in ids))
+    found = [c for cid, c in zip(ids, cached) if c and _is_current(cid, c)]
+    missing = [cid for cid, c in zip(ids, cached) if not c or not _is_current(cid, c)]
+    if missing:
+        found += await _select_rows(client, missing)
+    return found
+
+
+async def get_latest_channels(client: SupabaseClient, chat_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Return the most recent channel of each chat in *chat_ids*, keyed by chat id.
+
+    One query for all chats: the channels are embedded in the chats query,
+    limited to the newest one per chat (the discussion log is not fetched).
+    Channels that are still in flight are overlaid with their live status.
+    """
+    resp = await (
+        client.table(_CHATS_TABLE)
+        .select(f"id,{_TABLE}({_SUMMARY_COLUMNS})")
+        .in_("id", chat_ids)
+        .order("created_at", desc=True, foreign_table=_TABLE)
+        .order("id", desc=True, foreign_table=_TABLE)
+        .limit(1, foreign_table=_TABLE)
+        .execute()
+    )
+    latest: Dict[str, Dict[str, Any]] = {
+        chat["id"]: chat[_TABLE][0] for chat in resp.data or [] if chat.get(_TABLE)
+    }
+
+    store = get_status_store()
+    for chat_id, row in latest.items():
+        if row.get("status") not in _TERMINAL_STATUSES:
+            live = await store.get(row["id"])
+            if live:
+                latest[chat_id] = {**row, **{k: v for k, v in live.items() if k != "log"}}
+    return latest
+
+
+async def watch_channel(client: SupabaseClient, channel_id: str) -> AsyncIterator[Dict[str, Any]]:
+    """Yield the channel's status now and after every change until it ends.
+
+    Channels run by this worker push their transitions; for channels running
+    elsewhere (shared Redis status store) the status is re-read periodically.
+    Nothing is yielded for an unknown *channel_id*.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    _watchers.setdefault(channel_id, set()).add(queue)
+    try:
+        status = await get_channel_status(client, channel_id)
+        while status is not None:
+            yield status
+            if status.get("status") in _TERMINAL_STATUSES:
+                return
+            if channel_id in _channels:
+                status = await queue.get()
+            else:
+                await asyncio.sleep(_WATCH_POLL_INTERVAL)
+                status = await get_channel_status(client, channel_id)
+    finally:
+        queues = _watchers.get(channel_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del _watchers[channel_id]
+
+
+async def wait_for_channel(client: SupabaseClient, channel_id: str, timeout: float) -> Dict[str, Any] | None:
+    """Long-poll form of `get_channel_status`.
+
+    Returns as soon as the channel has finished or failed, otherwise its latest
+    status after *timeout* seconds (None for an unknown *channel_id*).
+    """
+    latest: Dict[str, Any] | None = None
+
+    async def _follow() -> None:
+        nonlocal latest
+        async with aclosing(watch_channel(client, channel_id)) as updates:
+            async for status in updates:
+                latest = status
+
+    try:
+        await asyncio.wait_for(_follow(), timeout)
+    except asyncio.TimeoutError:
+        pass
+    return latest
+
+
+async def cancel_running_channels() -> None:
+    """Cancel in-flight channel tasks (called on application shutdown).
+
+    Channels run as tasks on the server's event loop, so they must be stopped
+    before the Supabase client and the Agent HTTP pools they use are closed.
+    """
+    tasks = list(_tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
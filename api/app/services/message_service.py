@@ -1,52 +1,72 @@
 """Supabase helper functions for Message table interactions."""
 from __future__ import annotations
 
-import asyncio
 import uuid
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, List, Optional
 
-from supabase import Client as SupabaseClient
+from postgrest import ReturnMethod
+from supabase import AsyncClient as SupabaseClient
+
+from .pagination import Cursor, after_filter, before_filter, row_cursor
 
 _TABLE = "messages"
 
 # ---------------------------------------------------------------------------
-# Blocking helpers (run in threadpool)
+# Low-level helpers
 # ---------------------------------------------------------------------------
 
-def _insert(client: SupabaseClient, payload: Dict[str, Any]) -> Dict[str, Any]:
-    resp = client.table(_TABLE).insert(payload).execute()
+async def _insert(
+    client: SupabaseClient,
+    payload: Dict[str, Any],
+    returning: ReturnMethod = ReturnMethod.representation,
+) -> Dict[str, Any] | None:
+    resp = await client.table(_TABLE).insert(payload, returning=returning).execute()
     return resp.data[0] if resp.data else None
 
 
-def _select_by_chat(client: SupabaseClient, chat_id: uuid.UUID) -> List[Dict[str, Any]]:
-    resp = (
-        client.table(_TABLE)
-        .select("*")
-        .eq("chat_id", str(chat_id))
-        .order("created_at", desc=False)
-        .execute()
-    )
-    return resp.data or []
+async def _select_by_chat(
+    client: SupabaseClient,
+    chat_id: uuid.UUID,
+    limit: Optional[int] = None,
+    before: Optional[Cursor] = None,
+) -> List[Dict[str, Any]]:
+    query = client.table(_TABLE).select("*").eq("chat_id", str(chat_id))
+    if before is not None:
+        query = query.or_(before_filter(before))
+    if limit is None:
+        resp = await query.order("created_at", desc=False).order("id", desc=False).execute()
+        return resp.data or []
+    # Page backwards from the newest message, then restore chronological order
+    resp = await query.order("created_at", desc=True).order("id", desc=True).limit(limit).execute()
+    return (resp.data or [])[::-1]
+
+
+def _ordered_ids(n: int) -> List[str]:
+    """*n* new message ids in ascending order.
+
+    Rows inserted by one request share the database's ``now()``; listings break
+    such ``created_at`` ties by id, so these ids keep the rows in payload order.
+    """
+    return sorted(str(uuid.uuid4()) for _ in range(n))
 
 # ---------------------------------------------------------------------------
 # Public async API
 # ---------------------------------------------------------------------------
 
 
-def _update_by_channel(client: SupabaseClient, channel_id: str, content: str) -> Dict[str, Any] | None:
+async def _update_by_channel(client: SupabaseClient, channel_id: str, content: str) -> None:
     """Update the *content* of the assistant placeholder linked to *channel_id*.
 
     We only ever expect a single placeholder message for a given channel so the
-    UPDATE should affect at most one row. We return the updated row (or *None*
-    if no placeholder was found).
+    UPDATE should affect at most one row. The row is not echoed back: the
+    caller already has the content, and it can be a long consensus answer.
     """
-    resp = (
+    await (
         client.table(_TABLE)
-        .update({"content": content})
+        .update({"content": content}, returning=ReturnMethod.minimal)
         .eq("channel_id", channel_id)
         .execute()
     )
-    return resp.data[0] if resp.data else None
 
 
 async def fill_assistant_placeholder(
@@ -55,9 +75,10 @@ async def fill_assistant_placeholder(
     content: str,
 ):
     """Replace the empty placeholder content with the final *answer*."""
-    return await asyncio.to_thread(_update_by_channel, client, channel_id, content)
+    await _update_by_channel(client, channel_id, content)
 
-async def create_user_message(client: SupabaseClient, chat_id: uuid.UUID, content: str):
+async def create_user_message(client: SupabaseClient, chat_id: uuid.UUID, content: str) -> None:
+    """Persist a user turn (nothing reads the stored row back)."""
     payload = {
         "chat_id": str(chat_id),
         "role": "user",
@@ -65,19 +86,7 @@ async def create_user_message(client: SupabaseClient, chat_id: uuid.UUID, conten
         "generation_mode": "direct",
         "content": content,
     }
-    return await asyncio.to_thread(_insert, client, payload)
-
-
-async def create_assistant_placeholder(client: SupabaseClient, chat_id: uuid.UUID, channel_id: str):
-    payload = {
-        "chat_id": str(chat_id),
-        "role": "assistant",
-        "model": "consensus",
-        "generation_mode": "consensus",
-        "channel_id": channel_id,
-        "content": "",
-    }
-    return await asyncio.to_thread(_insert, client, payload)
+    await _insert(client, payload, returning=ReturnMethod.minimal)
 
 
 async def create_assistant_message(client: SupabaseClient, chat_id: uuid.UUID, model: str, content: str):
@@ -88,8 +97,123 @@ async def create_assistant_message(client: SupabaseClient, chat_id: uuid.UUID, m
         "generation_mode": "direct",
         "content": content,
     }
-    return await asyncio.to_thread(_insert, client, payload)
+    return await _insert(client, payload)
+
+
+async def create_exchange(
+    client: SupabaseClient,
+    chat_id: uuid.UUID,
+    user_content: str,
+    model: str,
+    assistant_content: str,
+) -> Dict[str, Any]:
+    """Persist a user turn and its direct reply in one request; return the reply row.
+
+    Both rows get the same database ``created_at``; their ids (see
+    `_ordered_ids`) keep the user turn first.
+    """
+    user_id, reply_id = _ordered_ids(2)
+    payloads = [
+        {
+            "id": user_id,
+            "chat_id": str(chat_id),
+            "role": "user",
+            "model": "user",
+            "generation_mode": "direct",
+            "content": user_content,
+        },
+        {
+            "id": reply_id,
+            "chat_id": str(chat_id),
+            "role": "assistant",
+            "model": model,
+            "generation_mode": "direct",
+            "content": assistant_content,
+        },
+    ]
+    resp = await client.table(_TABLE).insert(payloads).execute()
+    return resp.data[-1]
+
+
+async def create_consensus_exchange(
+    client: SupabaseClient,
+    chat_id: uuid.UUID,
+    user_content: str,
+    channel_id: str,
+) -> Dict[str, Any]:
+    """Persist a user turn and the empty placeholder of its consensus answer in
+    one request; return the placeholder row (ordered as in `create_exchange`).
+    """
+    user_id, placeholder_id = _ordered_ids(2)
+    payloads = [
+        {
+            "id": user_id,
+            "chat_id": str(chat_id),
+            "role": "user",
+            "model": "user",
+            "generation_mode": "direct",
+            "content": user_content,
+        },
+        {
+            "id": placeholder_id,
+            "chat_id": str(chat_id),
+            "role": "assistant",
+            "model": "consensus",
+            "generation_mode": "consensus",
+            "channel_id": channel_id,
+            "content": "",
+        },
+    ]
+    resp = await client.table(_TABLE).insert(payloads).execute()
+    return resp.data[-1]
+
+
+async def list_messages(
+    client: SupabaseClient,
+    chat_id: uuid.UUID,
+    *,
+    limit: Optional[int] = None,
+    before: Optional[Cursor] = None,
+):
+    """Return the chat's messages in chronological order.
+
+    With *limit*, only the newest *limit* messages before the *before* cursor
+    (keyset pagination on ``(created_at, id)``); without it, all of them.
+    """
+    return await _select_by_chat(client, chat_id, limit, before)
 
 
-async def list_messages(client: SupabaseClient, chat_id: uuid.UUID):
-    return await asyncio.to_thread(_select_by_chat, client, chat_id)
+async def latest_message_id(client: SupabaseClient, chat_id: uuid.UUID) -> Optional[str]:
+    """Return the id of the chat's newest message (None if it has none)."""
+    resp = await (
+        client.table(_TABLE)
+        .select("id")
+        .eq("chat_id", str(chat_id))
+        .order("created_at", desc=True)
+        .order("id", desc=True)
+        .limit(1)
+        .execute()
+    )
+    return resp.data[0]["id"] if resp.data else None
+
+
+async def iter_message_pages(
+    client: SupabaseClient, chat_id: uuid.UUID, page_size: int
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Yield the chat's messages in chronological pages of at most *page_size* rows.
+
+    Each page continues after the last row of the previous one (keyset on
+    ``(created_at, id)``), so later pages cost no more than the first.
+    """
+    after: Optional[Cursor] = None
+    while True:
+        query = client.table(_TABLE).select("*").eq("chat_id", str(chat_id))
+        if after is not None:
+            query = query.or_(after_filter(after))
+        resp = await query.order("created_at", desc=False).order("id", desc=False).limit(page_size).execute()
+        rows = resp.data or []
+        if rows:
+            yield rows
+        if len(rows) < page_size:
+            return
+        after = row_cursor(rows[-1])
@@ -4,13 +4,27 @@ This service lazily downloads the list of available models from
 https://openrouter.ai/api/v1/models and caches the response in memory for a
 configurable period of time (default: 6 hours). The cached data is then served
 by the API router with optional client-side filtering (search and pagination).
+
+Each download is also written to a JSON snapshot on local disk
+(``CONSENSUS_MODELS_CACHE_PATH``, default in the temp directory; set it empty to
+disable). A restarted process or another worker on the same host loads that
+snapshot instead of downloading again while it is younger than the TTL.
 """
 from __future__ import annotations
 
+import asyncio
+import logging
+import os
+import tempfile
 import time
-from typing import Any, List
+from collections import defaultdict
+from typing import Any, Dict, List, NamedTuple, Set, Tuple
+
+import orjson
+
+from app.agent import Agent
 
-import httpx
+logger = logging.getLogger(__name__)
 
 # Public URL that returns all available models in ~400 kB JSON.
 _OPENROUTER_MODELS_URL = "https://openrouter.ai/api/v1/models"
@@ -22,48 +36,158 @@ _REFRESH_SECONDS = 60 * 60 * 6  # 6 h
 # In-memory cache representation
 # ---------------------------------------------------------------------------
 
-_cached_models: List[dict[str, Any]] = []
+class ModelIndex(NamedTuple):
+    """Cached models plus a parallel list of lowercase ``"{id}\n{name}"`` search keys.
+
+    ``trigrams`` maps every 3-character substring of the search keys to the
+    positions of the models containing it.
+    """
+
+    models: List[dict[str, Any]]
+    haystacks: List[str]
+    trigrams: Dict[str, Set[int]]
+
+
+_cached_index = ModelIndex([], [], {})
 _last_refresh_ts: float = 0.0
+# Serialises downloads so concurrent requests after expiry trigger one fetch
+_refresh_lock = asyncio.Lock()
+_background_refresh: asyncio.Task | None = None
+
+
+def _build_index(models: List[dict[str, Any]]) -> ModelIndex:
+    # Lower-cased once per refresh rather than once per model per search request
+    haystacks = [f"{m.get('id') or ''}\n{m.get('name') or ''}".lower() for m in models]
+    trigrams: Dict[str, Set[int]] = defaultdict(set)
+    for i, haystack in enumerate(haystacks):
+        for j in range(len(haystack) - 2):
+            trigrams[haystack[j : j + 3]].add(i)
+    return ModelIndex(models, haystacks, dict(trigrams))
+
+
+def search_models(index: ModelIndex, query: str) -> List[dict[str, Any]]:
+    """Return the models whose id or name contains *query* (case-insensitive), in order."""
+    needle = query.lower()
+    if len(needle) < 3:
+        candidates: Any = range(len(index.models))
+    else:
+        postings = sorted(
+            (index.trigrams.get(needle[j : j + 3], set()) for j in range(len(needle) - 2)),
+            key=len,
+        )
+        candidates = sorted(postings[0].intersection(*postings[1:]))
+    # Trigram hits are only candidates: confirm the full substring
+    return [index.models[i] for i in candidates if needle in index.haystacks[i]]
 
 
 async def _download_models() -> List[dict[str, Any]]:
     """Download the models list from OpenRouter and return the JSON payload."""
-    async with httpx.AsyncClient(timeout=30) as client:
-        resp = await client.get(_OPENROUTER_MODELS_URL)
-        resp.raise_for_status()
-        raw = resp.json()
-        # The OpenRouter API may evolve; handle dict payloads gracefully.
-        if isinstance(raw, dict):
-            # Common pattern {"data": [...]} or {<id>: {...}}
-            if "data" in raw and isinstance(raw["data"], list):
-                raw = raw["data"]
-            else:
-                raw = list(raw.values())
-        data: List[dict[str, Any]] = raw  # type: ignore
-        return data
-
-
-async def get_models(force_refresh: bool = False) -> List[dict[str, Any]]:
-    """Return the cached models list, refreshing it if stale.
+    # Same host as the chat completions: reuse the agents' warm HTTP/2 pool
+    # (closed on shutdown with Agent.aclose) instead of a fresh connection.
+    resp = await Agent.http_client().get(_OPENROUTER_MODELS_URL, timeout=30)
+    resp.raise_for_status()
+    raw = resp.json()
+    # The OpenRouter API may evolve; handle dict payloads gracefully.
+    if isinstance(raw, dict):
+        # Common pattern {"data": [...]} or {<id>: {...}}
+        if "data" in raw and isinstance(raw["data"], list):
+            raw = raw["data"]
+        else:
+            raw = list(raw.values())
+    data: List[dict[str, Any]] = raw  # type: ignore
+    return data
+
+
+async def get_model_index(force_refresh: bool = False) -> ModelIndex:
+    """Return the cached models and their search keys, refreshing them if stale.
+
+    Only the first load waits for OpenRouter; once the cache expires the stale
+    list is returned while a single background task downloads the new one.
 
     Args:
         force_refresh: If *True*, always download the latest list regardless
             of cache age.
     """
-    global _cached_models, _last_refresh_ts
+    global _background_refresh
 
-    # Decide if we need to re-download the models list.
-    need_refresh = (
-        force_refresh
-        or not _cached_models
-        or (time.time() - _last_refresh_ts) > _REFRESH_SECONDS
+    if force_refresh or not _cached_index.models:
+        return await _refresh(force=force_refresh)
+
+    if _is_stale() and (_background_refresh is None or _background_refresh.done()):
+        # Serve the stale list now and swap in the new one when it arrives
+        _background_refresh = asyncio.create_task(_refresh_in_background())
+    return _cached_index
+
+
+def _is_stale() -> bool:
+    return not _cached_index.models or (time.time() - _last_refresh_ts) > _REFRESH_SECONDS
+
+
+async def _refresh(force: bool = False) -> ModelIndex:
+    """Load (snapshot) or download and index the models list unless another caller just did."""
+    global _cached_index, _last_refresh_ts
+
+    async with _refresh_lock:
+        # Re-check: the refresh we waited for may have done the work already
+        if force or _is_stale():
+            snapshot = None if force else await asyncio.to_thread(_read_snapshot)
+            if snapshot is not None:
+                models, _last_refresh_ts = snapshot
+            else:
+                models = await _download_models()
+                _last_refresh_ts = time.time()
+                await asyncio.to_thread(_write_snapshot, models)
+            _cached_index = _build_index(models)
+    return _cached_index
+
+
+def _snapshot_path() -> str:
+    return os.getenv(
+        "CONSENSUS_MODELS_CACHE_PATH",
+        os.path.join(tempfile.gettempdir(), "openrouter_models.json"),
     )
 
-    if need_refresh:
-        _cached_models = await _download_models()
-        _last_refresh_ts = time.time()
 
-    return _cached_models
+def _read_snapshot() -> Tuple[List[dict[str, Any]], float] | None:
+    """Return the snapshot's models and write time if it is still fresh."""
+    path = _snapshot_path()
+    if not path:
+        return None
+    try:
+        written_at = os.path.getmtime(path)
+        if time.time() - written_at > _REFRESH_SECONDS:
+            return None
+        with open(path, "rb") as fh:
+            models = orjson.loads(fh.read())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+    return (models, written_at) if isinstance(models, list) and models else None
+
+
+def _write_snapshot(models: List[dict[str, Any]]) -> None:
+    path = _snapshot_path()
+    if not path:
+        return
+    # Write then rename, so other workers never read a partial file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as fh:
+            fh.write(orjson.dumps(models))
+        os.replace(tmp_path, path)
+    except OSError as exc:
+        logger.warning("Could not write the models snapshot to %s: %s", path, exc)
+
+
+async def _refresh_in_background() -> None:
+    try:
+        await _refresh()
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.warning("Background refresh of the models list failed: %s", exc)
+
+
+async def get_models(force_refresh: bool = False) -> List[dict[str, Any]]:
+    """Return the cached models list, refreshing it if stale."""
+    return (await get_model_index(force_refresh)).models
 
 
 # Convenience synchronous wrapper ------------------------------------------------
@@ -0,0 +1,47 @@
+"""Keyset pagination over ``(created_at, id)`` for Supabase list queries.
+
+Rows are ordered by ``created_at`` with ``id`` as tiebreak, so rows sharing a
+timestamp are neither skipped nor repeated across pages. A cursor names the
+last row of a page as ``"<created_at>,<id>"`` and is opaque to clients.
+"""
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Tuple
+
+__all__ = ["Cursor", "after_filter", "before_filter", "decode_cursor", "encode_cursor", "row_cursor"]
+
+Cursor = Tuple[datetime, uuid.UUID]
+
+
+def encode_cursor(row: Dict[str, Any]) -> str:
+    """Cursor pointing at *row* (pages continue with the rows before it)."""
+    return f"{row['created_at']},{row['id']}"
+
+
+def row_cursor(row: Dict[str, Any]) -> Cursor:
+    """The (created_at, id) position of a fetched *row*."""
+    return decode_cursor(encode_cursor(row))
+
+
+def decode_cursor(value: str) -> Cursor:
+    """Parse a cursor made by `encode_cursor`; raises ValueError if malformed."""
+    created_at, sep, row_id = value.rpartition(",")
+    if not sep:
+        raise ValueError("cursor must be '<created_at>,<id>'")
+    return datetime.fromisoformat(created_at), uuid.UUID(row_id)
+
+
+def before_filter(cursor: Cursor) -> str:
+    """PostgREST ``or`` filter for rows strictly before *cursor* in (created_at, id) order."""
+    created_at, row_id = cursor
+    ts = created_at.isoformat()
+    return f'created_at.lt."{ts}",and(created_at.eq."{ts}",id.lt.{row_id})'
+
+
+def after_filter(cursor: Cursor) -> str:
+    """PostgREST ``or`` filter for rows strictly after *cursor* in (created_at, id) order."""
+    created_at, row_id = cursor
+    ts = created_at.isoformat()
+    return f'created_at.gt."{ts}",and(created_at.eq."{ts}",id.gt.{row_id})'
@@ -8,7 +8,8 @@ simple heuristic so that the request handler never breaks.
 """
 
 import asyncio
-from app.agent import Agent
+
+from app.agent import get_agent
 
 # NOTE: Pick an inexpensive model on OpenRouter.  Adjust as needed.
 _DEFAULT_MODEL = "mistralai/mistral-7b-instruct:free"
@@ -18,6 +19,8 @@ _PROMPT_PREFIX = (
     "Return a short title (max-6-words) describing the user message. "
     "Do NOT wrap it in quotes.\n\nUser message: "
 )
+# A slow title model must not hold up the reply it runs alongside
+_TIMEOUT_SECONDS = 4.0
 
 async def make_title(user_msg: str) -> str:
     """Return a short, human-readable title for *user_msg*.
@@ -32,14 +35,11 @@ async def make_title(user_msg: str) -> str:
 
     # --- 1) Attempt LLM generation ----------------------------------------
     try:
-        # Offload to a thread to avoid blocking the event loop – the OpenAI
-        # client is synchronous.
-        def _call_llm() -> str | None:
-            agent = Agent(_DEFAULT_MODEL)
-            return agent.chat([
-                {"role": "user", "content": _PROMPT_PREFIX + user_msg}
-            ])
-        raw: str | None = await asyncio.to_thread(_call_llm)
+        agent = get_agent(_DEFAULT_MODEL)
+        raw: str | None = await asyncio.wait_for(
+            agent.achat([{"role": "user", "content": _PROMPT_PREFIX + user_msg}]),
+            timeout=_TIMEOUT_SECONDS,
+        )
         if raw:
             # Clean & truncate – at most 6 words, 120 chars (DB limit)
             cleaned = " ".join(raw.strip().strip('"\'').split()[:6])
@@ -1,11 +1,11 @@
 """Supabase-backed implementation of user CRUD operations."""
 from __future__ import annotations
 
-import asyncio
 from typing import Any, Dict
 from uuid import UUID
 
-from supabase import Client as SupabaseClient
+from postgrest import ReturnMethod
+from supabase import AsyncClient as SupabaseClient
 
 from app.services.auth_service import get_password_hash
 
@@ -13,49 +13,68 @@ __all__ = [
     "get_user_by_email",
     "get_user_by_id",
     "create_user",
+    "update_password_hash",
     "delete_user",
 ]
 
 _TABLE = "users"
 
 
-def _select_single(client: SupabaseClient, **filters: Any) -> Dict[str, Any] | None:
+async def _select_single(client: SupabaseClient, **filters: Any) -> Dict[str, Any] | None:
     query = client.table(_TABLE).select("*")
     for field, value in filters.items():
         query = query.eq(field, value)
     # maybe_single() raises on 0 or >1 rows; using execute() and checking data safer
-    resp = query.limit(1).execute()
+    resp = await query.limit(1).execute()
     return resp.data[0] if resp.data else None
 
 
 # removed unused alias
 
 async def get_user_by_email(client: SupabaseClient, email: str):
-    return await asyncio.to_thread(_select_single, client, email=email)
+    return await _select_single(client, email=email)
 
 
 async def get_user_by_id(client: SupabaseClient, user_id: UUID):
-    return await asyncio.to_thread(_select_single, client, id=str(user_id))
+    return await _select_single(client, id=str(user_id))
 
 
 async def create_user(client: SupabaseClient, email: str, password: str):
-    """Insert a new user and return the created row (or None on failure)."""
-    hashed_password = get_password_hash(password)
-
-    def _insert() -> dict | None:
-        resp = (
-            client.table(_TABLE)
-            .insert({"email": email, "hashed_password": hashed_password})
-            .execute()
+    """Insert a new user and return the created row.
+
+    Returns None when the email is already registered: the insert is an
+    ``INSERT ... ON CONFLICT (email) DO NOTHING``, so the existence check and
+    the write are one atomic statement.
+    """
+    hashed_password = await get_password_hash(password)
+
+    resp = await (
+        client.table(_TABLE)
+        .upsert(
+            {"email": email, "hashed_password": hashed_password},
+            on_conflict="email",
+            ignore_duplicates=True,
         )
-        return resp.data[0] if resp.data else None
+        .execute()
+    )
+    return resp.data[0] if resp.data else None
+
 
-    return await asyncio.to_thread(_insert)
+async def update_password_hash(client: SupabaseClient, user_id: UUID, hashed_password: str) -> None:
+    """Replace a user's stored password hash (e.g. after a scheme upgrade)."""
+    await (
+        client.table(_TABLE)
+        .update({"hashed_password": hashed_password}, returning=ReturnMethod.minimal)
+        .eq("id", str(user_id))
+        .execute()
+    )
 
 
 async def delete_user(client: SupabaseClient, user_id: UUID):
     """Delete a user row by ID."""
-    def _delete() -> None:
-        client.table(_TABLE).delete().eq("id", str(user_id)).execute()
-
-    await asyncio.to_thread(_delete)
+    await (
+        client.table(_TABLE)
+        .delete(returning=ReturnMethod.minimal)
+        .eq("id", str(user_id))
+        .execute()
+    )
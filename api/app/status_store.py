@@ -0,0 +1,91 @@
+"""Shared store for live consensus-channel status.
+
+`consensus_service` keeps the status of every channel it runs (pending →
+running → finished/error) so that polling clients are answered without a
+Supabase round-trip. By default that state lives in process memory, which ties
+every poll to the worker that spawned the channel. With
+``CONSENSUS_STATUS_BACKEND=redis`` (and ``REDIS_URL``) the records are kept in
+Redis instead, so any uvicorn worker can answer, and they expire after an hour.
+
+Only the JSON-serialisable status dict is shared; live `Channel` objects stay
+in the process that runs them.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Protocol
+
+__all__ = [
+    "StatusStore",
+    "MemoryStatusStore",
+    "RedisStatusStore",
+    "get_status_store",
+]
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_TTL = 60 * 60  # seconds
+_DEFAULT_MAXSIZE = 1000
+
+
+class StatusStore(Protocol):
+    """Async key/value interface for channel status records."""
+
+    async def get(self, channel_id: str) -> Dict[str, Any] | None: ...
+
+    async def set(self, channel_id: str, status: Dict[str, Any]) -> None: ...
+
+
+class MemoryStatusStore:
+    """Per-process LRU (single worker deployments).
+
+    Only the *maxsize* most recently updated channels are kept. Evicted
+    channels are answered from Supabase, where finished runs are persisted.
+    """
+
+    def __init__(self, maxsize: int = _DEFAULT_MAXSIZE) -> None:
+        self.maxsize = maxsize
+        self._data: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+
+    async def get(self, channel_id: str) -> Dict[str, Any] | None:
+        return self._data.get(channel_id)
+
+    async def set(self, channel_id: str, status: Dict[str, Any]) -> None:
+        self._data[channel_id] = status
+        self._data.move_to_end(channel_id)
+        while len(self._data) > self.maxsize:
+            evicted_id, evicted = self._data.popitem(last=False)
+            if evicted.get("status") in ("pending", "running"):
+                logger.warning("Evicted status of unfinished channel %s", evicted_id)
+
+
+class RedisStatusStore:
+    """Status shared by all workers (requires ``redis``)."""
+
+    def __init__(self, url: str, ttl: int = _DEFAULT_TTL) -> None:
+        import redis.asyncio as redis  # imported lazily to avoid mandatory dependency
+
+        self._client = redis.Redis.from_url(url, decode_responses=True)
+        self.ttl = ttl
+
+    async def get(self, channel_id: str) -> Dict[str, Any] | None:
+        raw = await self._client.get(f"chan:{channel_id}")
+        return json.loads(raw) if raw else None
+
+    async def set(self, channel_id: str, status: Dict[str, Any]) -> None:
+        await self._client.set(f"chan:{channel_id}", json.dumps(status, default=str), ex=self.ttl)
+
+
+@lru_cache(maxsize=1)
+def get_status_store() -> StatusStore:
+    """Return the process-wide status store."""
+    if os.getenv("CONSENSUS_STATUS_BACKEND", "memory").lower() == "redis":
+        url = os.getenv("REDIS_URL")
+        if not url:
+            raise RuntimeError("CONSENSUS_STATUS_BACKEND=redis requires REDIS_URL to be set.")
+        return RedisStatusStore(url)
+    return MemoryStatusStore()
@@ -0,0 +1,7 @@
+from app.schemas.message import UserMessageCreate
+
+
+def test_empty_participant_models_is_accepted():
+    # The web client always sends the list, empty when nothing is selected
+    msg = UserMessageCreate(content="x", use_consensus=True, participant_models=[])
+    assert msg.participant_models == []
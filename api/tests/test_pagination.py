@@ -0,0 +1,33 @@
+import uuid
+
+import pytest
+
+from app.services.pagination import after_filter, before_filter, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    row = {"created_at": "2024-01-01T00:00:00.123456+00:00", "id": str(uuid.uuid4())}
+    created_at, row_id = decode_cursor(encode_cursor(row))
+    assert created_at.isoformat() == row["created_at"]
+    assert str(row_id) == row["id"]
+
+
+def test_before_filter_breaks_timestamp_ties_by_id():
+    row_id = uuid.uuid4()
+    cursor = decode_cursor(f"2024-01-01T00:00:00+00:00,{row_id}")
+    assert before_filter(cursor) == (
+        'created_at.lt."2024-01-01T00:00:00+00:00",'
+        f'and(created_at.eq."2024-01-01T00:00:00+00:00",id.lt.{row_id})'
+    )
+
+
+@pytest.mark.parametrize("value", ["2024-01-01T00:00:00+00:00", "garbage,also-garbage"])
+def test_malformed_cursor_is_rejected(value):
+    with pytest.raises(ValueError):
+        decode_cursor(value)
+
+
+def test_after_filter_mirrors_before_filter():
+    row_id = uuid.uuid4()
+    cursor = decode_cursor(f"2024-01-01T00:00:00+00:00,{row_id}")
+    assert after_filter(cursor) == before_filter(cursor).replace(".lt.", ".gt.")
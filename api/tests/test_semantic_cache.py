@@ -0,0 +1,58 @@
+import asyncio
+
+import app.channel as channel_module
+from app.channel import Channel, ChannelConfig
+from app.semantic_cache import SemanticCache
+
+
+class _FakeAgent:
+    """Stands in for `Agent`: fixed replies, fixed embeddings, counted calls."""
+
+    def __init__(self, model, reply="", embeddings=None):
+        self.model = model
+        self.reply = reply
+        self.embeddings = embeddings or {}
+        self.calls = 0
+
+    async def achat(self, messages, cache_bypass=False):
+        self.calls += 1
+        return self.reply
+
+    async def achat_n(self, messages, n):
+        self.calls += 1
+        return [self.reply] * n
+
+    async def aembed(self, text):
+        return self.embeddings[text]
+
+
+def _run(task, scope, participants):
+    guide = _FakeAgent("guide", reply="CONSENSUS_REACHED: Paris")
+    config = ChannelConfig(max_rounds=2, semantic_cache=True, cache_scope=scope)
+    return asyncio.run(Channel(task, guide, participants, config).run())
+
+
+def test_paraphrased_task_in_the_same_chat_hits(monkeypatch):
+    embedder = _FakeAgent(
+        "embed",
+        embeddings={
+            "Capital of France?": [1.0, 0.0],
+            "What is the capital of France?": [0.95, 0.05],
+            "Capital of Peru?": [0.0, 1.0],
+        },
+    )
+    cache = SemanticCache(embedder)
+    monkeypatch.setattr(channel_module, "get_semantic_cache", lambda: cache)
+    participants = [_FakeAgent("a", reply="Paris"), _FakeAgent("b", reply="Lyon")]
+
+    assert _run("Capital of France?", "chat-1", participants) == "Paris"
+    calls = sum(p.calls for p in participants)
+
+    # A later paraphrase in the same chat is answered without a discussion
+    assert _run("What is the capital of France?", "chat-1", participants) == "Paris"
+    assert sum(p.calls for p in participants) == calls
+
+    # Another chat, or a dissimilar task, runs the discussion again
+    _run("What is the capital of France?", "chat-2", participants)
+    _run("Capital of Peru?", "chat-1", participants)
+    assert sum(p.calls for p in participants) == 3 * calls